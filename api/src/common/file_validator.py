@@ -8,16 +8,21 @@ Validates file size, type, content, and security with centralized configuration
 import hashlib
 import imghdr
 import mimetypes
+import shutil
+import tempfile
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import Any, BinaryIO, Callable, Dict, FrozenSet, List, Optional, Union
 
 from src.core.config import settings
 from src.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Chunk size used when spooling upload streams to disk
+UPLOAD_COPY_CHUNK_SIZE = 1024 * 1024
+
 
 class FileCategory(str, Enum):
     """File categories for different use cases"""
@@ -36,19 +41,20 @@ class FileValidationConfig:
     File validation configuration for different categories
     """
     category: FileCategory
-    allowed_extensions: Set[str]
-    allowed_mime_types: Set[str]
+    allowed_extensions: FrozenSet[str]
+    allowed_mime_types: FrozenSet[str]
     max_size_bytes: int
     min_size_bytes: int = 0
     check_content: bool = True
     description: str = ""
 
     def __post_init__(self):
-        """Normalize extensions to lowercase with dot prefix"""
-        self.allowed_extensions = {
+        """Normalize extensions to lowercase with dot prefix, and MIME types to lowercase"""
+        self.allowed_extensions = frozenset(
             ext.lower() if ext.startswith(".") else f".{ext.lower()}"
             for ext in self.allowed_extensions
-        }
+        )
+        self.allowed_mime_types = frozenset(map(str.lower, self.allowed_mime_types))
 
 
 class FileValidationResult:
@@ -117,14 +123,14 @@ class FileValidator:
     """
 
     # Dangerous file extensions that should never be allowed
-    DANGEROUS_EXTENSIONS = {
+    DANGEROUS_EXTENSIONS = frozenset({
         '.exe', '.dll', '.bat', '.cmd', '.com', '.scr', '.pif',
         '.app', '.deb', '.rpm', '.dmg', '.pkg', '.run',
         '.vbs', '.vbe', '.js', '.jse', '.ws', '.wsf', '.wsh',
         '.ps1', '.ps2', '.psc1', '.psc2', '.msh', '.msh1', '.msh2',
         '.scf', '.lnk', '.inf', '.reg', '.msi', '.msp', '.cpl',
         '.jar', '.sh', '.bash', '.csh', '.ksh', '.command',
-    }
+    })
 
     # Default validation configurations
     DEFAULT_CONFIGS = {
@@ -243,8 +249,11 @@ class FileValidator:
 
         if hasattr(settings, "allowed_extensions"):
             # Parse allowed extensions from settings
-            allowed_exts = settings.allowed_extensions.split(",")
-            allowed_exts = {f".{ext.strip().lower()}" for ext in allowed_exts}
+            allowed_exts = frozenset(
+                f".{ext.strip().lower().lstrip('.')}"
+                for ext in settings.allowed_extensions.split(",")
+                if ext.strip()
+            )
 
             # Update image config with settings
             if FileCategory.IMAGE in self.configs:
@@ -284,23 +293,25 @@ class FileValidator:
             logger.debug("MIME type detected (extension)", mime_type=mime_type)
             return mime_type
         
-        # Method 2: Check magic numbers (content-based)
+        # Method 2: Check magic numbers (content-based); only the first
+        # 32 bytes are read, and they are reused by imghdr below
+        header = None
         try:
             with open(file_path, "rb") as f:
                 header = f.read(32)
 
-                for mime, signatures in self.MAGIC_NUMBERS.items():
-                    for signature in signatures:
-                        if header.startswith(signature):
-                            logger.debug("MIME type detected (magic)", mime_type=mime)
-                            return mime
+            for mime, signatures in self.MAGIC_NUMBERS.items():
+                for signature in signatures:
+                    if header.startswith(signature):
+                        logger.debug("MIME type detected (magic)", mime_type=mime)
+                        return mime
         except Exception as e:
             logger.warning("Failed to read file header", error=str(e))
 
         # Method 3: Image-specific detection using imghdr
-        if file_path.suffix.lower() in {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}:
+        if header and file_path.suffix.lower() in {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}:
             try:
-                img_type = imghdr.what(file_path)
+                img_type = imghdr.what(None, h=header)
                 if img_type:
                     mime_type = f"image/{img_type}"
                     logger.debug("MIME type detected (imghdr)", mime_type=mime_type)
@@ -326,16 +337,16 @@ class FileValidator:
             # Check for script tags in text files
             if file_path.suffix.lower() in {'.txt', '.html', '.htm', '.xml', '.svg'}:
                 with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read(10000)
+                    content = f.read(10000).lower()
 
-                    dangerous_patterns = [
-                        '<script', 'javascript:', 'onerror=', 'onclick=',
-                        'onload=', '<iframe', '<embed', '<object'
-                    ]
+                dangerous_patterns = [
+                    '<script', 'javascript:', 'onerror=', 'onclick=',
+                    'onload=', '<iframe', '<embed', '<object'
+                ]
 
-                    for pattern in dangerous_patterns:
-                        if pattern in content.lower():
-                            warnings.append(f"Potentially dangerous content detected: {pattern}")
+                for pattern in dangerous_patterns:
+                    if pattern in content:
+                        warnings.append(f"Potentially dangerous content detected: {pattern}")
 
         except Exception as e:
             logger.warning("Content check failed", error=str(e))
@@ -392,13 +403,10 @@ class FileValidator:
             Hash string or None
         """
         try:
-            hash_obj = hashlib.new(algorithm)
-
+            # file_digest reads into a reused buffer and hashes
+            # outside the GIL, using the CPU's SHA extensions via OpenSSL
             with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(8192), b''):
-                    hash_obj.update(chunk)
-
-            return hash_obj.hexdigest()
+                return hashlib.file_digest(f, algorithm).hexdigest()
         
         except Exception as e:
             logger.warning("Hash calculation failed", error=str(e))
@@ -549,15 +557,15 @@ class FileValidator:
             metadata=metadata,
         )
     
-    def validate_upload(
-        self, file_content: bytes, filename: str, category: FileCategory,
-        save_to: Optional[Path] = None,
+    def _validate_temp_copy(
+        self, write: Callable[[BinaryIO], None], filename: str,
+        category: FileCategory, save_to: Optional[Path] = None,
     ) -> FileValidationResult:
         """
-        Validate uploaded file content
+        Write upload content to a temporary file and validate it
 
         Args:
-            file_content: File content as bytes
+            write: Callable writing the content into the temporary file
             filename: Original filename
             category: File category
             save_to: Optional path to save validated file
@@ -565,14 +573,16 @@ class FileValidator:
         Returns:
             FileValidationResult
         """
-        import tempfile
-
         # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(filename).suffix) as temp_file:
-            temp_file.write(file_content)
-            temp_path = Path(temp_file.name)
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=Path(filename).suffix)
+        temp_path = Path(temp_file.name)
 
         try:
+            # Copying from the upload stream can fail midway (e.g. client
+            # disconnects), so the write is covered by the cleanup below
+            with temp_file:
+                write(temp_file)
+
             # Validate temporary file
             result = self.validate_file(
                 file_path=temp_path, category=category
@@ -599,12 +609,34 @@ class FileValidator:
             logger.error("File upload validation failed", error=str(e))
             raise
 
+    def validate_upload(
+        self, file_content: bytes, filename: str, category: FileCategory,
+        save_to: Optional[Path] = None,
+    ) -> FileValidationResult:
+        """
+        Validate uploaded file content
+
+        Args:
+            file_content: File content as bytes
+            filename: Original filename
+            category: File category
+            save_to: Optional path to save validated file
+
+        Returns:
+            FileValidationResult
+        """
+        return self._validate_temp_copy(
+            lambda temp_file: temp_file.write(file_content),
+            filename, category, save_to,
+        )
+
     def validate_fastapi_upload(
         self, file: Any, category: FileCategory,
         save_to: Optional[Path] = None,
     ) -> FileValidationResult:
         """
         Validate FastAPI UploadFile
+        The upload is copied to disk in chunks rather than read into memory
 
         Args:
             file: FastAPI UploadFile object
@@ -614,20 +646,18 @@ class FileValidator:
         Returns:
             FileValidationResult
         """
-        # Read file content
-        content = file.file.read()
-
-        # Reset file pointer
         file.file.seek(0)
+        try:
+            return self._validate_temp_copy(
+                lambda temp_file: shutil.copyfileobj(
+                    file.file, temp_file, UPLOAD_COPY_CHUNK_SIZE
+                ),
+                file.filename, category, save_to,
+            )
+        finally:
+            # Reset file pointer so the upload can be streamed on to S3
+            file.file.seek(0)
 
-        # Validate
-        return self.validate_upload(
-            file_content=content,
-            filename=file.filename,
-            category=category,
-            save_to=save_to,
-        )
-    
 
 # Global validator instance
 file_validator = FileValidator()
@@ -6,22 +6,56 @@ Handles upload, download, delete, presigned URLs, and metadata operations
 """
 
 import mimetypes
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from functools import cached_property
 from io import BytesIO
 from pathlib import Path
-from typing import Any, BinaryIO, Dict, List, Optional, Union
+from tempfile import SpooledTemporaryFile
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
 from urllib.parse import quote
 
-import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.client import Config
 from botocore.exceptions import BotoCoreError, ClientError
 
+from src.core.aws import get_boto3_session
 from src.core.config import settings
 from src.core.exceptions import FileUploadError
 from src.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Managed transfers move objects in 8 MiB parts (ranged GETs for downloads),
+# so memory use per upload stays bounded regardless of the file size
+TRANSFER_CONFIG = TransferConfig(
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=4,
+)
+
+
+def build_content_disposition(filename: str, disposition: str = "attachment") -> str:
+    """
+    Build an RFC 6266 Content-Disposition header value
+    Carries an ASCII fallback filename plus the UTF-8 encoded original
+
+    Args:
+        filename: Original filename
+        disposition: 'attachment' or 'inline'
+
+    Returns:
+        Content-Disposition header value
+    """
+    filename = Path(filename).name
+    # Control characters (CR/LF included) would break or inject header lines
+    fallback = "".join(
+        "_" if c in '\\"' or ord(c) < 0x20 or c == "\x7f" else c
+        for c in filename.encode("ascii", "replace").decode("ascii")
+    )
+    return f'{disposition}; filename="{fallback}"; filename*=UTF-8\'\'{quote(filename)}'
+
 
 class S3FileMetadata:
     """
@@ -84,6 +118,24 @@ class S3Service:
     - Lifecycle management integration
     """
 
+    # Client methods presigned URLs can be generated for, by HTTP method
+    PRESIGNED_METHODS = {
+        "GET": "get_object",
+        "PUT": "put_object",
+        "DELETE": "delete_object",
+    }
+
+    # Largest source copy_object accepts (5 GiB)
+    COPY_OBJECT_MAX_SIZE = 5 * 1024 ** 3
+
+    # Source headers carried over by the multipart copy when metadata is kept
+    COPY_PRESERVED_HEADERS = (
+        "ContentType", "CacheControl", "ContentDisposition", "ContentEncoding",
+    )
+
+    # Upper bound on cached presigned GET URLs
+    PRESIGNED_URL_CACHE_SIZE = 10000
+
     def __init__(
         self, bucket_name: Optional[str] = None, region_name: Optional[str] = None,
         use_accelerate: bool = False
@@ -100,30 +152,31 @@ class S3Service:
         self.region_name = region_name or settings.aws_region
         self.use_accelerate = use_accelerate
 
-        # Initialize S3 client with signature V4
-        config = Config(
+        # Presigned GET URLs by (key, expiration, filename): (url, reuse deadline)
+        # kept in least-recently-used order and shared across threadpool workers
+        self._presigned_url_cache: OrderedDict[tuple, tuple[str, float]] = OrderedDict()
+        self._presigned_url_lock = threading.Lock()
+
+        # Initialize S3 client with signature V4; adaptive retries back off
+        # and rate-limit client-side when S3 answers with 503 SlowDown.
+        # The client is thread-safe and shared process-wide, so its pool is
+        # sized for concurrent requests and multipart transfer threads
+        self._config = Config(
             signature_version="s3v4",
             s3={"addressing_style": "auto"},
+            retries={"mode": "adaptive", "max_attempts": 10},
+            max_pool_connections=settings.s3_max_pool_connections,
+            tcp_keepalive=True,
         )
 
         try:
-            self.client = boto3.client(
-                "s3", region_name=self.region_name,
-                aws_access_key_id=settings.aws_access_key_id,
-                aws_secret_access_key=settings.aws_secret_access_key,
-                config=config,
-            )
+            # The process-wide session backs the client and the lazily built resource
+            self._session = get_boto3_session()
 
-            # Initialize S3 resource for higher-level operations
-            self.resource = boto3.resource(
-                "s3", region_name=self.region_name,
-                aws_access_key_id=settings.aws_access_key_id,
-                aws_secret_access_key=settings.aws_secret_access_key,
-                config=config,
+            self.client = self._session.client(
+                "s3", region_name=self.region_name, config=self._config,
             )
 
-            self.bucket = self.resource.Bucket(self.bucket_name)
-
             logger.info(
                 "S3 service initialized",
                 bucket=self.bucket_name,
@@ -134,6 +187,18 @@ class S3Service:
             logger.error("Failed to initialize S3 service", error=str(e))
             raise
 
+    @cached_property
+    def resource(self):
+        """S3 resource for higher-level operations, created on first use"""
+        return self._session.resource(
+            "s3", region_name=self.region_name, config=self._config,
+        )
+
+    @cached_property
+    def bucket(self):
+        """Bucket resource for the configured bucket, created on first use"""
+        return self.resource.Bucket(self.bucket_name)
+
     def _get_content_type(self, file_path: Union[str, Path]) -> str:
         """
         Detect content type from file extension
@@ -240,6 +305,7 @@ class S3Service:
                 Bucket=self.bucket_name,
                 Key=s3_key,
                 ExtraArgs=extra_args,
+                Config=TRANSFER_CONFIG,
             )
 
             # Get file size
@@ -289,7 +355,8 @@ class S3Service:
             **kwargs: Additional arguments for upload_file
 
         Returns:
-            Dictionary with upload details
+            Dictionary with upload details (file_size is None for
+            streams that can't seek)
         """
         # Detect content type from key if not provided
         if not content_type:
@@ -304,17 +371,22 @@ class S3Service:
             extra_args["ServerSideEncryption"] = "AES256"
 
         try:
-            # Get file size
-            file_obj.seek(0, 2)
-            file_size = file_obj.tell()
-            file_obj.seek(0)
-
-            # Upload
+            # Get file size; streams that can't seek (pipes, request
+            # bodies) are uploaded part by part as they are read
+            file_size = None
+            seekable = getattr(file_obj, "seekable", None)
+            if seekable is not None and seekable():
+                file_obj.seek(0, 2)
+                file_size = file_obj.tell()
+                file_obj.seek(0)
+
+            # Upload in parts; the object is never read into memory whole
             self.client.upload_fileobj(
                 Fileobj=file_obj,
                 Bucket=self.bucket_name,
                 Key=s3_key,
                 ExtraArgs=extra_args,
+                Config=TRANSFER_CONFIG,
             )
 
             logger.info(
@@ -374,11 +446,12 @@ class S3Service:
         local_path.parent.mkdir(parents=True, exist_ok=True)
 
         try:
-            # Download file
+            # Download file; large objects are fetched as parallel byte ranges
             self.client.download_file(
                 Bucket=self.bucket_name,
                 Key=s3_key,
                 Filename=str(local_path),
+                Config=TRANSFER_CONFIG,
             )
 
             file_size = local_path.stat().st_size
@@ -420,10 +493,12 @@ class S3Service:
             Number of bytes downloaded
         """
         try:
+            # Large objects are fetched as parallel byte ranges
             self.client.download_fileobj(
                 Bucket=self.bucket_name,
                 Key=s3_key,
                 Fileobj=file_obj,
+                Config=TRANSFER_CONFIG,
             )
 
             # Get size
@@ -452,6 +527,78 @@ class S3Service:
         file_obj = BytesIO()
         self.download_fileobj(s3_key, file_obj)
         return file_obj.getvalue()
+
+    def download_as_file(
+        self, s3_key: str, max_memory_size: int = 8 * 1024 * 1024,
+    ) -> SpooledTemporaryFile:
+        """
+        Download S3 object into a seekable temporary file
+        Small objects stay in memory; larger ones spill to disk instead of
+        being held as one bytes buffer
+
+        Args:
+            s3_key: S3 object key
+            max_memory_size: Size in bytes above which content spills to disk
+
+        Returns:
+            Temporary file positioned at the start of the content
+        """
+        file_obj = SpooledTemporaryFile(max_size=max_memory_size)
+
+        try:
+            self.download_fileobj(s3_key, file_obj)
+        except Exception:
+            file_obj.close()
+            raise
+
+        return file_obj
+
+    def stream_file(
+        self, s3_key: str, chunk_size: int = 64 * 1024,
+        if_none_match: Optional[str] = None,
+    ) -> Tuple[S3FileMetadata, Optional[Iterator[bytes]]]:
+        """
+        Stream S3 object content in chunks
+        Suitable for StreamingResponse; only one chunk is held in memory at a time
+
+        Args:
+            s3_key: S3 object key
+            chunk_size: Size of each chunk in bytes
+            if_none_match: ETag the client already has (from If-None-Match)
+
+        Returns:
+            Object metadata and an iterator over the object content;
+            the iterator is None when the object still matches if_none_match
+        """
+        params = {"Bucket": self.bucket_name, "Key": s3_key}
+        if if_none_match:
+            params["IfNoneMatch"] = if_none_match
+
+        # The object is requested up front so a missing key
+        # raises here rather than midway through a response
+        try:
+            response = self.client.get_object(**params)
+        except ClientError as e:
+            error_code = e.response["Error"]["Code"]
+
+            # Unchanged since the client fetched it; no body is transferred
+            if error_code == "304":
+                headers = e.response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+                return S3FileMetadata({"ETag": headers.get("etag", if_none_match)}), None
+
+            if error_code == "NoSuchKey":
+                raise FileNotFoundError(f"S3 object not found: {s3_key}")
+
+            logger.error("S3 stream failed", s3_key=s3_key, error=str(e))
+            raise
+
+        logger.info(
+            "Streaming file from S3",
+            s3_key=s3_key,
+            size_bytes=response.get("ContentLength"),
+        )
+
+        return S3FileMetadata(response), response["Body"].iter_chunks(chunk_size)
     
     def delete_file(self, s3_key: str) -> bool:
         """
@@ -486,28 +633,31 @@ class S3Service:
         if not s3_keys:
             return {"deleted": 0, "errors": 0}
         
-        objects = [{"key": key} for key in s3_keys]
+        objects = [{"Key": key} for key in s3_keys]
 
         try:
+            # Quiet mode only reports failures, keeping the response small
             response = self.client.delete_objects(
                 Bucket=self.bucket_name,
-                Delete={"Objects": objects}
+                Delete={"Objects": objects, "Quiet": True}
             )
 
-            deleted = response.get("Deleted", [])
             errors = response.get("Errors", [])
+            error_keys = [err['Key'] for err in errors]
+            failed = set(error_keys)
+            deleted_keys = [key for key in s3_keys if key not in failed]
 
             logger.info(
                 "Bulk delete completed",
-                deleted=len(deleted),
+                deleted=len(deleted_keys),
                 errors=len(errors),
             )
 
             return {
-                "deleted": len(deleted),
+                "deleted": len(deleted_keys),
                 "errors": len(errors),
-                "deleted_keys": [obj['Key'] for obj in deleted],
-                "error_keys": [err['Key'] for err in errors],
+                "deleted_keys": deleted_keys,
+                "error_keys": error_keys,
             }
         
         except ClientError as e:
@@ -524,24 +674,27 @@ class S3Service:
         Returns:
             Dictionary with deletion results
         """
-        # List all objects with prefix
-        keys_to_delete = self.list_files(prefix=prefix, keys_only=True)
-
-        if not keys_to_delete:
-            logger.info("No objects found with prefix", prefix=prefix)
-            return {"deleted": 0, "errors": 0}
-
-        # Delete in batches of 1000 (S3 limit)
-        batch_size = 1000
         total_deleted = 0
         total_errors = 0
 
-        for i in range(0, len(keys_to_delete), batch_size):
-            batch = keys_to_delete[i:i + batch_size]
+        # Each listing page holds at most 1000 keys (the delete_objects
+        # limit), so pages are deleted as they are listed
+        paginator = self.client.get_paginator("list_objects_v2")
+        pages = paginator.paginate(Bucket=self.bucket_name, Prefix=prefix)
+
+        for page in pages:
+            batch = [obj["Key"] for obj in page.get("Contents", [])]
+            if not batch:
+                continue
+
             result = self.delete_files(batch)
             total_deleted += result["deleted"]
             total_errors += result["errors"]
 
+        if not total_deleted and not total_errors:
+            logger.info("No objects found with prefix", prefix=prefix)
+            return {"deleted": 0, "errors": 0}
+
         logger.info(
             "Prefix deletion completed",
             prefix=prefix, deleted=total_deleted,
@@ -605,36 +758,53 @@ class S3Service:
 
     def generate_presigned_url(
         self, s3_key: str, expiration: int = 3600,
-        http_method: str = "GET"
+        http_method: str = "GET", content_type: Optional[str] = None,
+        download_filename: Optional[str] = None,
     ) -> str:
         """
         Generate presigned URL for GET/PUT operations
+        PUT URLs let clients upload directly to S3 without
+        proxying the file through the API
 
         Args:
             s3_key: S3 object key
             expiration: URL expiration in seconds (default 1 hour)
             http_method: HTTP method ('GET', 'PUT', 'DELETE')
+            content_type: Content type a PUT upload must be sent with
+            download_filename: Filename a GET download is saved as
 
         Returns:
             Presigned URL string
         """
-        method_map = {
-            'GET': 'get_object',
-            'PUT': 'put_object',
-            'DELETE': 'delete_object',
-        }
-
-        client_method = method_map.get(http_method)
+        client_method = self.PRESIGNED_METHODS.get(http_method)
         if not client_method:
             raise ValueError(f"Invalid HTTP method: {http_method}")
-        
+
+        # Reuse a recently signed GET URL instead of signing again
+        cache_key = (s3_key, expiration, download_filename)
+        now = time.monotonic()
+        if http_method == "GET":
+            cached = self._get_cached_presigned_url(cache_key, now)
+            if cached is not None:
+                return cached
+
+        params = {
+            "Bucket": self.bucket_name,
+            "Key": s3_key,
+        }
+
+        # Signed into the URL, so the upload must use this content type
+        if content_type and http_method == "PUT":
+            params["ContentType"] = content_type
+
+        # S3 serves the download with this Content-Disposition header
+        if download_filename and http_method == "GET":
+            params["ResponseContentDisposition"] = build_content_disposition(download_filename)
+
         try:
             url = self.client.generate_presigned_url(
                 ClientMethod=client_method,
-                Params={
-                    "Bucket": self.bucket_name,
-                    "Key": s3_key,
-                },
+                Params=params,
                 ExpiresIn=expiration,
             )
 
@@ -645,12 +815,65 @@ class S3Service:
                 expiration=expiration,
             )
 
+            # A cached URL is handed out for at most half its lifetime,
+            # so callers always get most of the validity they asked for
+            cache_ttl = min(settings.s3_presigned_url_cache_seconds, expiration // 2)
+            if http_method == "GET" and cache_ttl > 0:
+                self._cache_presigned_url(cache_key, url, now + cache_ttl)
+
             return url
         
         except ClientError as e:
             logger.error("Failed to generate presigned URL", error=str(e))
             raise
 
+    def generate_presigned_urls(
+        self, s3_keys: List[str], expiration: int = 3600,
+    ) -> Dict[str, str]:
+        """
+        Generate presigned GET URLs for several objects in one call
+        Lets gallery-style callers fetch all URLs with a single request
+
+        Args:
+            s3_keys: S3 object keys
+            expiration: URL expiration in seconds (default 1 hour)
+
+        Returns:
+            Dictionary mapping each S3 key to its presigned URL
+        """
+        return {
+            s3_key: self.generate_presigned_url(s3_key, expiration)
+            for s3_key in dict.fromkeys(s3_keys)
+        }
+
+    def _get_cached_presigned_url(self, cache_key: tuple, now: float) -> Optional[str]:
+        """
+        Get a cached presigned URL that is still within its reuse window
+        Hits never extend the window, so a URL is not served past its deadline
+        """
+        with self._presigned_url_lock:
+            cached = self._presigned_url_cache.get(cache_key)
+            if cached is None:
+                return None
+
+            url, deadline = cached
+            if deadline <= now:
+                del self._presigned_url_cache[cache_key]
+                return None
+
+            self._presigned_url_cache.move_to_end(cache_key)
+            return url
+
+    def _cache_presigned_url(self, cache_key: tuple, url: str, deadline: float) -> None:
+        """Cache a presigned URL, evicting the least recently used entries once full"""
+        with self._presigned_url_lock:
+            cache = self._presigned_url_cache
+            cache[cache_key] = (url, deadline)
+            cache.move_to_end(cache_key)
+
+            while len(cache) > self.PRESIGNED_URL_CACHE_SIZE:
+                cache.popitem(last=False)
+
     def generate_presigned_post(
         self, s3_key: str, expiration: int = 3600,
         max_content_length: Optional[int] = None,
@@ -702,14 +925,18 @@ class S3Service:
 
     def list_files(
         self, prefix: Optional[str] = None, max_keys: int = 1000, keys_only: bool = False,
+        start_after: Optional[str] = None,
     ) -> Union[List[str], List[Dict[str, Any]]]:
         """
         List files in S3 bucket
+        Keys are listed in order; pass the last key of a page as start_after
+        to fetch the next one
 
         Args:
             prefix: Filter by prefix (folder path)
             max_keys: Maximum number of keys to return
             keys_only: Return only keys (True) or full metadata (False)
+            start_after: Only list keys that sort after this one
 
         Returns:
             List of keys or list of file metadata dictionaries
@@ -723,6 +950,9 @@ class S3Service:
             if prefix:
                 params["Prefix"] = prefix
 
+            if start_after:
+                params["StartAfter"] = start_after
+
             response = self.client.list_objects_v2(**params)
 
             contents = response.get("Contents", [])
@@ -747,26 +977,68 @@ class S3Service:
     def copy_file(
         self, source_key: str, destination_key: str,
         source_bucket: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
     ) -> bool:
         """
         Copy file within S3
+        The copy happens server-side; no data passes through the app
 
         Args:
             source_key: Source S3 key
             destination_key: Destination S3 key
             source_bucket: Source bucket (uses same bucket if not specified)
+            metadata: Replacement metadata (source metadata is kept if not specified)
 
         Returns:
             True if copied successfully
         """
         source_bucket = source_bucket or self.bucket_name
+        copy_source = {"Bucket": source_bucket, "Key": source_key}
+
+        extra_args = {}
+        if metadata is not None:
+            extra_args["Metadata"] = metadata
+            extra_args["MetadataDirective"] = "REPLACE"
 
         try:
-            self.client.copy_object(
-                Bucket=self.bucket_name,
-                CopySource={"Bucket": source_bucket, "Key": source_key},
-                Key=destination_key,
-            )
+            try:
+                self.client.copy_object(
+                    Bucket=self.bucket_name,
+                    CopySource=copy_source,
+                    Key=destination_key,
+                    **extra_args,
+                )
+            except ClientError as e:
+                # copy_object is limited to 5 GB sources; the managed copy
+                # splits larger objects into parallel upload_part_copy calls.
+                # S3 reports other failures as InvalidRequest too, so only
+                # fall back when the source really is over the limit
+                if e.response["Error"]["Code"] != "InvalidRequest":
+                    raise
+
+                source = self.client.head_object(Bucket=source_bucket, Key=source_key)
+                if source["ContentLength"] <= self.COPY_OBJECT_MAX_SIZE:
+                    raise
+
+                # The multipart copy starts a fresh upload, so the source's
+                # headers and metadata must be passed on explicitly to match
+                # copy_object. s3transfer runs its own HEAD for the size;
+                # the client offers no way to hand it the one above
+                if metadata is None:
+                    extra_args = {
+                        key: source[key]
+                        for key in self.COPY_PRESERVED_HEADERS
+                        if source.get(key)
+                    }
+                    extra_args["Metadata"] = source.get("Metadata", {})
+
+                self.client.copy(
+                    CopySource=copy_source,
+                    Bucket=self.bucket_name,
+                    Key=destination_key,
+                    ExtraArgs=extra_args,
+                    Config=TRANSFER_CONFIG,
+                )
 
             logger.info(
                 "File copied in S3",
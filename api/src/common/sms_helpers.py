@@ -5,14 +5,19 @@ SMS Helper Functions for Common Restaurant Fleet Platform Scenarios
 Provides convenient methods for OTP, order notifications, and delivery updates
 """
 
-from datetime import datetime
-from typing import Any, Dict, List, Optional
-from uuid import UUID
+from __future__ import annotations
 
-from src.common.sms_service import SMSType, sms_service, SNSSMSService
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from src.common.sms_service import (
+    SMSType, mask_phone_number, sms_service, SNSSMSService
+)
 from src.core.config import settings
 from src.core.logging import get_logger
 
+if TYPE_CHECKING:
+    from datetime import datetime
+
 logger = get_logger(__name__)
 
 
@@ -60,7 +65,7 @@ class SMSHelpers:
 
             logger.info(
                 "Verification OTP sent",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 purpose=purpose,
                 message_id=result.get("message_id"),
             )
@@ -70,7 +75,7 @@ class SMSHelpers:
         except Exception as e:
             logger.error(
                 "Failed to send verification OTP",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 purpose=purpose,
                 error=str(e),
             )
@@ -103,13 +108,13 @@ class SMSHelpers:
             if is_valid:
                 logger.info(
                     "OTP verified successfully",
-                    phone_number=phone_number[:5] + "***",
+                    phone_number=mask_phone_number(phone_number),
                     purpose=purpose,
                 )
             else:
                 logger.warning(
                     "OTP verification failed",
-                    phone_number=phone_number[:5] + "***",
+                    phone_number=mask_phone_number(phone_number),
                     purpose=purpose,
                 )
 
@@ -118,7 +123,7 @@ class SMSHelpers:
         except Exception as e:
             logger.error(
                 "OTP verification error",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 error=str(e),
             )
             return False
@@ -159,7 +164,7 @@ class SMSHelpers:
 
             logger.info(
                 "Order confirmation SMS sent",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 order_number=order_number,
                 message_id=result.get("message_id"),
             )
@@ -169,7 +174,7 @@ class SMSHelpers:
         except Exception as e:
             logger.error(
                 "Failed to send order confirmation SMS",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 order_number=order_number,
                 error=str(e),
             )
@@ -205,7 +210,7 @@ class SMSHelpers:
 
             logger.info(
                 "Order status update SMS sent",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 order_number=order_number,
                 status=status,
                 message_id=result.get("message_id"),
@@ -216,7 +221,7 @@ class SMSHelpers:
         except Exception as e:
             logger.error(
                 "Failed to send order status update SMS",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 order_number=order_number,
                 error=str(e),
             )
@@ -258,7 +263,7 @@ class SMSHelpers:
 
             logger.info(
                 "Delivery assignment SMS sent",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 order_number=order_number,
                 message_id=result.get("message_id"),
             )
@@ -268,7 +273,7 @@ class SMSHelpers:
         except Exception as e:
             logger.error(
                 "Failed to send delivery assignment SMS",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 order_number=order_number,
                 error=str(e),
             )
@@ -305,7 +310,7 @@ class SMSHelpers:
 
             logger.info(
                 "Delivery completed SMS sent",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 order_number=order_number,
                 message_id=result.get("message_id"),
             )
@@ -315,7 +320,7 @@ class SMSHelpers:
         except Exception as e:
             logger.error(
                 "Failed to send delivery completed SMS",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 order_number=order_number,
                 error=str(e),
             )
@@ -354,7 +359,7 @@ class SMSHelpers:
 
             logger.info(
                 "Payment confirmation SMS sent",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 order_number=order_number,
                 message_id=result.get("message_id"),
             )
@@ -364,7 +369,7 @@ class SMSHelpers:
         except Exception as e:
             logger.error(
                 "Failed to send payment confirmation SMS",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 order_number=order_number,
                 error=str(e),
             )
@@ -407,7 +412,7 @@ class SMSHelpers:
 
             logger.info(
                 "Driver assignment SMS sent",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 order_number=order_number,
                 message_id=result.get("message_id"),
             )
@@ -417,7 +422,7 @@ class SMSHelpers:
         except Exception as e:
             logger.error(
                 "Failed to send driver assignment SMS",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 order_number=order_number,
                 error=str(e),
             )
@@ -459,7 +464,7 @@ class SMSHelpers:
 
             logger.info(
                 "Restaurant new order alert SMS sent",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 order_number=order_number,
                 message_id=result.get("message_id"),
             )
@@ -469,7 +474,7 @@ class SMSHelpers:
         except Exception as e:
             logger.error(
                 "Failed to send restaurant new order alert SMS",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 order_number=order_number,
                 error=str(e),
             )
@@ -550,10 +555,10 @@ class SMSHelpers:
         Returns:
             Send result dictionary
         """
-        time_str = booking_time.strftime("%I:%M %p")
-        date_str = booking_time.strftime("%d %b")
-        
-        message = f"Reminder: Your table at {restaurant_name} is booked for {time_str}, {date_str}"
+        message = (
+            f"Reminder: Your table at {restaurant_name} is booked for "
+            f"{booking_time:%I:%M %p, %d %b}"
+        )
         
         if table_number:
             message += f". Table: {table_number}"
@@ -570,7 +575,7 @@ class SMSHelpers:
 
             logger.info(
                 "Table booking reminder SMS sent",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 restaurant_name=restaurant_name,
                 message_id=result.get("message_id"),
             )
@@ -580,7 +585,7 @@ class SMSHelpers:
         except Exception as e:
             logger.error(
                 "Failed to send table booking reminder SMS",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 restaurant_name=restaurant_name,
                 error=str(e),
             )
@@ -638,7 +643,7 @@ class SMSHelpers:
 
             logger.info(
                 "Account alert SMS sent",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 alert_type=alert_type,
                 message_id=result.get("message_id"),
             )
@@ -648,7 +653,7 @@ class SMSHelpers:
         except Exception as e:
             logger.error(
                 "Failed to send account alert SMS",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 alert_type=alert_type,
                 error=str(e),
             )
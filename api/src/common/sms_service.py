@@ -6,28 +6,75 @@ Supports direct SMS, template rendering, OTP generation, and comprehensive error
 Follows AWS best practices for SMS deliverability and compliance
 """
 
-import re
+import asyncio
+import secrets
+import sys
+import threading
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from string import Formatter
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from uuid import uuid4
 
-import boto3
+from botocore.client import Config
 from botocore.exceptions import BotoCoreError, ClientError
 
+from src.core.aws import get_boto3_session
 from src.core.config import settings
+from src.core.exceptions import SMSServiceError
 from src.core.logging import get_logger
 from src.core.redis import redis_service
 
 logger = get_logger(__name__)
 
 
+def mask_phone_number(phone_number: str) -> str:
+    """Mask a phone number for logging, keeping only its prefix"""
+    return f"{phone_number[:5]}***"
+
+
+# Separators people type into phone numbers
+PHONE_SEPARATORS_TABLE = str.maketrans("", "", " -().\t/")
+
+
 class SMSType(str, Enum):
     """SMS message types as per AWS SNS"""
     PROMOTIONAL = "Promotional"
     TRANSACTIONAL = "Transactional"
 
 
+def compile_template(template: str) -> Callable[[Dict[str, Any]], str]:
+    """
+    Pre-parse a template into literal/field pairs once
+    so rendering skips the str.format parser on every send
+
+    Args:
+        template: Template string with {variable} placeholders
+
+    Returns:
+        Function rendering the template from a variables dictionary
+    """
+    parsed = list(Formatter().parse(template))
+
+    # Format specs, conversions and attribute/index lookups need the full parser
+    if any(
+        spec or conversion or (field is not None and not field.isidentifier())
+        for _, field, spec, conversion in parsed
+    ):
+        return lambda variables: template.format(**variables)
+
+    parts = tuple((literal, field) for literal, field, _, _ in parsed)
+
+    def render(variables: Dict[str, Any]) -> str:
+        return "".join([
+            literal if field is None else literal + str(variables[field])
+            for literal, field in parts
+        ])
+
+    return render
+
+
 class SMSTemplate:
     """SMS message template with variable substitution"""
 
@@ -41,6 +88,7 @@ class SMSTemplate:
         """
         self.template = template
         self.variables = variables or {}
+        self._render = compile_template(template)
 
     def render(self, **additional_vars) -> str:
         """
@@ -53,7 +101,7 @@ class SMSTemplate:
             Rendered message string
         """
         all_vars = {**self.variables, **additional_vars}
-        return self.template.format(**all_vars)
+        return self._render(all_vars)
     
 
 class SNSSMSService:
@@ -79,6 +127,10 @@ class SNSSMSService:
     MAX_MESSAGE_LENGTH = 160
     MAX_MESSAGE_LENGTH_UNICODE = 70
 
+    # (single-part capacity, multipart segment capacity) keyed by is_gsm7
+    # Multipart GSM-7 has 153 chars per part, UCS-2 has 67
+    SEGMENT_CAPACITY = {True: (160, 153), False: (70, 67)}
+
     # GSM-7 CHARSET (standard SMS characters)
     GSM7_BASIC = set(
        "@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞ\x1bÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?"
@@ -88,8 +140,31 @@ class SNSSMSService:
     # Characters that require escaping in GSM-7 (count as 2 characters)
     GSM7_EXTENDED = set("^{}\\[~]|€")
 
-    # Default message templates
-    DEFAULT_TEMPLATES = {
+    # Translation tables that delete GSM-7 characters so classification runs in C
+    GSM7_BASIC_STRIP_TABLE = str.maketrans("", "", "".join(GSM7_BASIC))
+    GSM7_EXTENDED_STRIP_TABLE = str.maketrans("", "", "".join(GSM7_EXTENDED))
+
+    # Approximate pricing in USD per part (update with actual rates)
+    SMS_PRICING = {
+        ("91", "Transactional"): 0.00645, ("91", "Promotional"): 0.00258,  # India
+        ("1", "Transactional"): 0.00645, ("1", "Promotional"): 0.00645,  # US/Canada
+        ("44", "Transactional"): 0.05, ("44", "Promotional"): 0.04,  # UK
+    }
+    DEFAULT_SMS_PRICING = {"Transactional": 0.01, "Promotional": 0.005}
+
+    # Priced country codes, longest first for prefix matching
+    PRICED_COUNTRY_CODES = tuple(
+        sorted({code for code, _ in SMS_PRICING}, key=len, reverse=True)
+    )
+
+    # SMS type message attributes, shared across sends
+    SMS_TYPE_ATTRIBUTES = {
+        sms_type: {"DataType": "String", "StringValue": sms_type.value}
+        for sms_type in SMSType
+    }
+
+    # Default message templates, exposed read-only as DEFAULT_TEMPLATES
+    _DEFAULT_TEMPLATES = {
         "otp": "Your verification code is {otp}. Valid for {validity} minutes. Do not share this code.",
         "order_confirmation": "Order {order_number} confirmed! Estimated delivery: {delivery_time}. Track: {track_url}",
         "order_update": "Order {order_number} status: {status}. {message}",
@@ -99,6 +174,16 @@ class SNSSMSService:
         "booking_reminder": "Reminder: Your table booking at {restaurant_name} is at {time} today.",
     }
 
+    # Templates are read-only; freeze them and intern the shared strings
+    DEFAULT_TEMPLATES = MappingProxyType({
+        name: sys.intern(template) for name, template in _DEFAULT_TEMPLATES.items()
+    })
+
+    # Default templates pre-parsed at class load
+    COMPILED_TEMPLATES = MappingProxyType({
+        name: compile_template(template) for name, template in DEFAULT_TEMPLATES.items()
+    })
+
     def __init__(
         self, region_name: Optional[str] = None, default_sender_id: Optional[str] = None,
         default_sms_type: SMSType = SMSType.TRANSACTIONAL,
@@ -114,19 +199,47 @@ class SNSSMSService:
         self.region_name = region_name or settings.aws_region
         self.default_sender_id = default_sender_id
         self.default_sms_type = default_sms_type
+        self.default_sender_attribute = (
+            {"DataType": "String", "StringValue": default_sender_id}
+            if default_sender_id else None
+        )
+
+        # Created on first use; SNS calls run in worker threads, so the
+        # lock keeps concurrent first calls from building several clients
+        self._client = None
+        self._client_lock = threading.Lock()
 
-        # Initialize SNS client
+    @property
+    def client(self):
+        """
+        SNS client, created on first use
+        Access it from the worker thread making the call, since
+        building it resolves credentials and would block the event loop
+        """
+        client = self._client
+        if client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._create_client()
+                client = self._client
+        return client
+
+    def _create_client(self):
+        """Build the SNS client from the shared session with a pool sized for concurrent sends"""
         try:
-            self.client = boto3.client(
+            client = get_boto3_session().client(
                 "sns", region_name=self.region_name,
-                aws_access_key_id=settings.aws_access_key_id,
-                aws_secret_access_key=settings.aws_secret_access_key,
+                config=Config(
+                    max_pool_connections=settings.sms_concurrency,
+                    retries={"mode": "standard", "max_attempts": 3},
+                ),
             )
             logger.info(
                 "SNS SMS client initialized",
                 region=self.region_name,
-                default_sms_type=default_sms_type,
+                default_sms_type=self.default_sms_type,
             )
+            return client
         except Exception as e:
             logger.error("Failed to initialize SNS SMS client", error=str(e))
             raise
@@ -141,12 +254,18 @@ class SNSSMSService:
         Returns:
             True if valid, False otherwise
         """
-        # E.164 format: +[country code][number]
+        # E.164 format: + followed by 2-15 ASCII digits, first one non-zero
         # Example: +919876543210 (India), +12025551234 (USA)
-        pattern = r"^\+[1-9]\d{1,14}$"
-
-        if not re.match(pattern, phone_number):
-            logger.warning("Invalid phone number format", phone_number=phone_number[:5] + "***")
+        digits = phone_number[1:]
+
+        if not (
+            phone_number.startswith("+")
+            and 2 <= len(digits) <= 15
+            and digits.isascii()
+            and digits.isdigit()
+            and digits[0] != "0"
+        ):
+            logger.warning("Invalid phone number format", phone_number=mask_phone_number(phone_number))
             return False
         
         return True
@@ -161,14 +280,39 @@ class SNSSMSService:
         Returns:
             Normalized phone number
         """
-        # Remove all non-digit characters except +
-        if not phone_number.startswith("+"):
-            # Assume India (+91) if no country code
-            # Adjust based on your primary market
-            phone_number = f"+91{phone_number}"
+        # Strip separators in a single pass
+        phone_number = phone_number.translate(PHONE_SEPARATORS_TABLE)
+
+        if phone_number.startswith("+"):
+            return phone_number
 
-        return phone_number
+        # Assume the primary market's country code if none given
+        return f"+{settings.default_country_code}{phone_number}"
     
+    @staticmethod
+    def _classify_message(message: str) -> Tuple[bool, int]:
+        """
+        Classify message encoding and count its SMS characters
+
+        Args:
+            message: Message text
+
+        Returns:
+            Tuple of (is_gsm7, char_count)
+        """
+        # Single full pass: whatever survives is extended or non-GSM-7
+        remainder = message.translate(SNSSMSService.GSM7_BASIC_STRIP_TABLE)
+
+        if not remainder:
+            return True, len(message)
+
+        # Message uses GSM-7 charset if only extended chars remain
+        if remainder.translate(SNSSMSService.GSM7_EXTENDED_STRIP_TABLE):
+            return False, len(message)
+
+        # Extended chars count as 2
+        return True, len(message) + len(remainder)
+
     def _calculate_message_parts(self, message: str) -> int:
         """
         Calculate number of SMS parts required
@@ -179,33 +323,27 @@ class SNSSMSService:
         Returns:
             Number of SMS parts
         """
-        # Check if message uses GSM-7 charset
-        is_gsm7 = all(
-            c in self.GSM7_BASIC or c in self.GSM7_EXTENDED for c in message
-        )
+        return self._count_parts(*self._classify_message(message))
 
-        if is_gsm7:
-            # Count characters (extended chars count as 2)
-            char_count = sum(
-                2 if c in self.GSM7_EXTENDED else 1 for c in message
-            )
+    def _count_parts(self, is_gsm7: bool, char_count: int) -> int:
+        """
+        Calculate number of SMS parts for an already classified message
 
-            if char_count <= 160:
-                return 1
-            else:
-                return (char_count - 1) // 153 + 1  # Multipart GSM-7
+        Args:
+            is_gsm7: Whether the message fits the GSM-7 charset
+            char_count: Message length in SMS characters
 
-        else:
-            # Unicode (UCS-2) encoding
-            char_count = len(message)
+        Returns:
+            Number of SMS parts
+        """
+        single_capacity, segment_capacity = self.SEGMENT_CAPACITY[is_gsm7]
 
-            if char_count <= 70:
-                return 1
-            else:
-                # Multi-part unicode messages have 67 char limit per part
-                return (char_count - 1) // 67 + 1
-            
-    def _optimize_message(self, message: str, max_parts: int = 1) -> str:
+        if char_count <= single_capacity:
+            return 1
+
+        return (char_count + segment_capacity - 1) // segment_capacity
+
+    def _optimize_message(self, message: str, max_parts: int = 1) -> Tuple[str, int]:
         """
         Optimize message to fit within specified parts
 
@@ -214,28 +352,24 @@ class SNSSMSService:
             max_parts: Maximum allowed parts
 
         Returns:
-            Optimized message
+            Tuple of (optimized message, number of SMS parts)
         """
-        current_parts = self._calculate_message_parts(message)
+        is_gsm7, char_count = self._classify_message(message)
+        current_parts = self._count_parts(is_gsm7, char_count)
 
         if current_parts <= max_parts:
-            return message
+            return message, current_parts
         
         # Calculate target length
-        is_gsm7 = all(
-            c in self.GSM7_BASIC or c in self.GSM7_EXTENDED for c in message
-        )
+        single_capacity, segment_capacity = self.SEGMENT_CAPACITY[is_gsm7]
 
         if max_parts == 1:
-            target_length = 160 if is_gsm7 else 70
+            target_length = single_capacity
         else:
-            target_length = (153 * max_parts) if is_gsm7 else (67 * max_parts)
+            target_length = segment_capacity * max_parts
 
         # Truncate and add ellipsis
-        if is_gsm7:
-            truncated = message[:target_length - 3] + "..."
-        else:
-            truncated = message[:target_length - 1] + "..."
+        truncated = message[:target_length - 3] + "..."
 
         logger.warning(
             "Message truncated to fit SMS limit",
@@ -244,7 +378,9 @@ class SNSSMSService:
             parts=max_parts
         )
 
-        return truncated
+        # Cutting off the non-GSM-7 characters can change the encoding,
+        # so the shorter text is counted again
+        return truncated, self._count_parts(*self._classify_message(truncated))
     
     async def send_sms(
         self, phone_number: str, message: str, sender_id: Optional[str] = None,
@@ -278,32 +414,29 @@ class SNSSMSService:
         
         # Optimize message length if needed
         if optimize:
-            message = self._optimize_message(message, max_parts=max_parts)
-
-        # Calculate message parts
-        parts = self._calculate_message_parts(message)
+            message, parts = self._optimize_message(message, max_parts=max_parts)
+        else:
+            parts = self._calculate_message_parts(message)
 
         if parts > max_parts:
             raise ValueError(
                 f"Message too long: {parts} parts (max {max_parts} allowed)"
             )
         
-        # Prepare message attributes
-        message_attributes = {}
-
-        # Set SMS type
+        # Prepare message attributes (static values are prebuilt)
         sms_type = sms_type or self.default_sms_type
-        message_attributes["AWS.SNS.SMS.SMSType"] = {
-            "DataType": "String",
-            "StringValue": sms_type.value,
+        message_attributes = {
+            "AWS.SNS.SMS.SMSType": self.SMS_TYPE_ATTRIBUTES[sms_type],
         }
 
         # Set Sender ID if provided (not supported in all countries)
-        if sender_id or self.default_sender_id:
+        if sender_id:
             message_attributes["AWS.SNS.SMS.SenderID"] = {
                 "DataType": "String",
-                "StringValue": sender_id or self.default_sender_id,
+                "StringValue": sender_id,
             }
+        elif self.default_sender_attribute:
+            message_attributes["AWS.SNS.SMS.SenderID"] = self.default_sender_attribute
 
         # Set max price if specified
         if max_price:
@@ -313,16 +446,18 @@ class SNSSMSService:
             }
 
         try:
-            # Send SMS via SNS
-            response = self.client.publish(
-                PhoneNumber=phone_number,
-                Message=message,
-                MessageAttributes=message_attributes
+            # Send SMS via SNS without blocking the event loop
+            response = await asyncio.to_thread(
+                lambda: self.client.publish(
+                    PhoneNumber=phone_number,
+                    Message=message,
+                    MessageAttributes=message_attributes
+                )
             )
 
             logger.info(
                 "SMS sent successfully",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 message_id=response.get("MessageId"),
                 message_length=len(message),
                 message_parts=parts,
@@ -345,7 +480,7 @@ class SNSSMSService:
                 "SNS SMS send failed",
                 error_code=error_code,
                 error_message=error_message,
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
             )
 
             # Map common SNS errors
@@ -382,15 +517,10 @@ class SNSSMSService:
         Returns:
             Send result dictionary
         """
-        if template_name not in self.DEFAULT_TEMPLATES:
+        if template_name not in self.COMPILED_TEMPLATES:
             raise ValueError(f"Unknown template: {template_name}")
         
-        template = SMSTemplate(
-            template=self.DEFAULT_TEMPLATES[template_name],
-            variables=variables,
-        )
-
-        message = template.render()
+        message = self.COMPILED_TEMPLATES[template_name](variables)
 
         return await self.send_sms(
             phone_number=phone_number,
@@ -398,6 +528,11 @@ class SNSSMSService:
             **kwargs,
         )
     
+    @staticmethod
+    def _new_otp(length: int) -> str:
+        """Generate numeric OTP from a cryptographically secure source"""
+        return f"{secrets.randbelow(10 ** length):0{length}d}"
+
     async def generate_otp(
         self, phone_number: str, length: int = 6, validity_minutes: int = 10,
         purpose: str = "verification"
@@ -414,10 +549,7 @@ class SNSSMSService:
         Returns:
             Generated OTP
         """
-        import random
-
-        # Generate numeric OTP
-        otp = "".join([str(random.randint(0, 9)) for _ in range(length)])
+        otp = self._new_otp(length)
 
         # Store in Redis with expiry
         redis_key = f"otp:{purpose}:{phone_number}"
@@ -428,7 +560,7 @@ class SNSSMSService:
 
         logger.info(
             "OTP generated",
-            phone_number=phone_number[:5] + "***",
+            phone_number=mask_phone_number(phone_number),
             length=length,
             validity_minutes=validity_minutes,
             purpose=purpose
@@ -436,6 +568,57 @@ class SNSSMSService:
 
         return otp
     
+    async def generate_otps(
+        self, phone_numbers: List[str], length: int = 6, validity_minutes: int = 10,
+        purpose: str = "verification"
+    ) -> Dict[str, str]:
+        """
+        Generate OTPs for multiple recipients and store them in one Redis round-trip
+
+        Args:
+            phone_numbers: Recipient phone numbers
+            length: OTP length (default 6 digits)
+            validity_minutes: OTP validity in minutes
+            purpose: OTP purpose (for key namespacing)
+
+        Returns:
+            Dictionary of phone number to generated OTP
+
+        Raises:
+            SMSServiceError: If the OTPs could not be stored
+        """
+        otps = {phone_number: self._new_otp(length) for phone_number in phone_numbers}
+
+        stored = await redis_service.set_many(
+            {f"otp:{purpose}:{phone_number}": otp for phone_number, otp in otps.items()},
+            expire=validity_minutes * 60,
+        )
+
+        # Codes that were never stored can't be verified, so don't send them
+        if not stored:
+            raise SMSServiceError("Failed to store OTPs")
+
+        logger.info(
+            "OTPs generated",
+            count=len(otps),
+            length=length,
+            validity_minutes=validity_minutes,
+            purpose=purpose
+        )
+
+        return otps
+
+    def _render_otp_message(
+        self, otp: str, validity_minutes: int, custom_message: Optional[str] = None
+    ) -> str:
+        """Render OTP message from custom or default template"""
+        if custom_message:
+            return custom_message.format(otp=otp, validity=validity_minutes)
+
+        return self.COMPILED_TEMPLATES["otp"](
+            {"otp": otp, "validity": validity_minutes}
+        )
+
     async def send_otp(
         self, phone_number: str, length: int = 6, validity_minutes: int = 10,
         purpose: str = "verification", custom_message: Optional[str] = None,
@@ -462,12 +645,7 @@ class SNSSMSService:
         )
 
         # Send OTP via SMS
-        if custom_message:
-            message = custom_message.format(otp=otp, validity=validity_minutes)
-        else:
-            message = self.DEFAULT_TEMPLATES["otp"].format(
-                otp=otp, validity=validity_minutes
-            )
+        message = self._render_otp_message(otp, validity_minutes, custom_message)
 
         result = await self.send_sms(
             phone_number=phone_number, message=message,
@@ -504,7 +682,7 @@ class SNSSMSService:
             if not stored_otp:
                 logger.warning(
                     "OTP verification failed: not found or expired",
-                    phone_number=phone_number[:5] + "***",
+                    phone_number=mask_phone_number(phone_number),
                     purpose=purpose
                 )
                 return False
@@ -512,7 +690,7 @@ class SNSSMSService:
             if stored_otp == otp:
                 logger.info(
                     "OTP verified successfully",
-                    phone_number=phone_number[:5] + "***",
+                    phone_number=mask_phone_number(phone_number),
                     purpose=purpose
                 )
 
@@ -523,18 +701,109 @@ class SNSSMSService:
             else:
                 logger.warning(
                     "OTP verification failed: incorrect OTP",
-                    phone_number=phone_number[:5] + "***",
+                    phone_number=mask_phone_number(phone_number),
                     purpose=purpose
                 )
                 return False
         except Exception as e:
             logger.error(
                 "OTP verification error",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 error=str(e)
             )
             return False
         
+    async def _send_each(
+        self, messages: List[Tuple[str, str]], **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Send (phone number, message) pairs concurrently
+
+        Args:
+            messages: List of recipient phone number and message pairs
+            **kwargs: Additional arguments for send_sms
+
+        Returns:
+            List of send results, failures included as error results
+        """
+        # Cap in-flight publishes to stay inside the SNS rate quota
+        semaphore = asyncio.Semaphore(settings.sms_concurrency)
+
+        async def send_one(phone_number: str, message: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.send_sms(
+                        phone_number=phone_number,
+                        message=message,
+                        **kwargs,
+                    )
+
+                except Exception as e:
+                    logger.error(
+                        "Bulk SMS failed for number",
+                        phone_number=mask_phone_number(phone_number),
+                        error=str(e)
+                    )
+                    return {
+                        "success": False,
+                        "phone_number": phone_number,
+                        "error": str(e),
+                    }
+
+        return list(await asyncio.gather(
+            *(send_one(phone_number, message) for phone_number, message in messages)
+        ))
+
+    async def send_bulk_otp(
+        self, phone_numbers: List[str], length: int = 6, validity_minutes: int = 10,
+        purpose: str = "verification", custom_message: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate and send OTPs to multiple recipients
+        OTPs are stored with a single pipelined Redis write
+
+        Args:
+            phone_numbers: Recipient phone numbers
+            length: OTP length
+            validity_minutes: OTP validity in minutes
+            purpose: OTP purpose
+            custom_message: Custom OTP message template
+
+        Returns:
+            List of send results
+        """
+        otps = await self.generate_otps(
+            phone_numbers=phone_numbers,
+            length=length,
+            validity_minutes=validity_minutes,
+            purpose=purpose,
+        )
+
+        results = await self._send_each(
+            [
+                (phone_number, self._render_otp_message(otp, validity_minutes, custom_message))
+                for phone_number, otp in otps.items()
+            ],
+            sms_type=SMSType.TRANSACTIONAL,
+        )
+
+        successful = 0
+        for result in results:
+            if result.get("success"):
+                result["otp_sent"] = True
+                result["validity_minutes"] = validity_minutes
+                successful += 1
+
+        # Log summary
+        logger.info(
+            "Bulk OTP completed",
+            total=len(results),
+            successful=successful,
+            failed=len(results) - successful
+        )
+
+        return results
+
     async def send_bulk_sms(
         self, phone_numbers: List[str], message: str, **kwargs,
     ) -> List[Dict[str, Any]]:
@@ -549,28 +818,9 @@ class SNSSMSService:
         Returns:
             List of send results
         """
-        results = []
-
-        for phone_number in phone_numbers:
-            try:
-                result = await self.send_sms(
-                    phone_number=phone_number,
-                    message=message,
-                    **kwargs,
-                )
-                results.append(result)
-
-            except Exception as e:
-                logger.error(
-                    "Bulk SMS failed for number",
-                    phone_number=phone_number[:5] + "***",
-                    error=str(e)
-                )
-                results.append({
-                    "success": False,
-                    "phone_number": phone_number,
-                    "error": str(e),
-                })
+        results = await self._send_each(
+            [(phone_number, message) for phone_number in phone_numbers], **kwargs
+        )
 
         # Log summary
         successful = sum(1 for r in results if r.get("success"))
@@ -597,19 +847,15 @@ class SNSSMSService:
         Returns:
             Estimated cost in USD
         """
-        # Get country code
-        country_code = phone_number[1:3] if phone_number.startswith("+1") else "91"
-
-        # Approximate pricing (update with actual rates)
-        # India: ~0.00645 per transactional sms
-        pricing = {
-            "91": {"Transactional": 0.00645, "Promotional": 0.00258},  # India
-            "1": {"Transactional": 0.00645, "Promotional": 0.00645},  # US/Canada
-            "44": {"Transactional": 0.05, "Promotional": 0.04},  # UK
-        }
+        # Match the longest priced country code prefix
+        country_code = next(
+            (code for code in self.PRICED_COUNTRY_CODES if phone_number.startswith(code, 1)),
+            None,
+        )
 
-        rate = pricing.get(country_code, {"Transactional": 0.01, "Promotional": 0.005})
-        cost_per_message = rate.get(sms_type.value, 0.01)
+        cost_per_message = self.SMS_PRICING.get(
+            (country_code, sms_type.value)
+        ) or self.DEFAULT_SMS_PRICING.get(sms_type.value, 0.01)
 
         return cost_per_message * parts
     
@@ -669,7 +915,7 @@ class SNSSMSService:
         except ClientError as e:
             logger.error(
                 "Failed to check opt-out status",
-                phone_number=phone_number[:5] + "***",
+                phone_number=mask_phone_number(phone_number),
                 error=str(e),
             )
             raise
@@ -686,12 +932,11 @@ class SNSSMSService:
             next_token = None
 
             while True:
-                if next_token:
-                    response = self.client.list_phone_numbers_opted_out(
-                        nextToken=next_token
-                    )
-                else:
-                    response = self.client.list_phone_numbers_opted_out()
+                # Page through SNS without blocking the event loop
+                params = {"nextToken": next_token} if next_token else {}
+                response = await asyncio.to_thread(
+                    lambda: self.client.list_phone_numbers_opted_out(**params)
+                )
 
                 opted_out.extend(response.get("phoneNumbers", []))
 
@@ -0,0 +1,22 @@
+# src/core/aws.py
+
+"""
+Shared AWS session
+Every boto3 client in the process is built from one session so credentials
+are resolved once
+"""
+
+from functools import lru_cache
+
+import boto3
+
+from src.core.config import settings
+
+
+@lru_cache(maxsize=1)
+def get_boto3_session() -> boto3.session.Session:
+    """Get the process-wide boto3 session shared by the S3 and SNS clients"""
+    return boto3.session.Session(
+        aws_access_key_id=settings.aws_access_key_id,
+        aws_secret_access_key=settings.aws_secret_access_key,
+    )
@@ -43,6 +43,7 @@ class Settings(BaseSettings):
     db_pool_timeout: int = 30
     db_pool_recycle: int = 3600
     db_echo: bool = False
+    db_statement_cache_size: int = 256
 
     redis_host: str = "localhost"
     redis_port: int = 6379
@@ -75,6 +76,12 @@ class Settings(BaseSettings):
     log_file_path: Optional[str] = None
     log_rotation: str = "1 day"
     log_retention: str = "30 days"
+    # Block-buffered stdout for log output; 0 keeps line-oriented writes.
+    # Only enable for a single process owning stdout: buffered flushes
+    # don't end on line boundaries, so workers sharing the fd tear lines
+    log_buffer_size: int = 0
+    log_flush_interval: float = 0.1
+    log_skip_paths: list[str] = ["/health", "/healthz", "/metrics"]
 
     rate_limit_enabled: bool = True
     rate_limit_per_minute: int = 60
@@ -101,6 +108,11 @@ class Settings(BaseSettings):
     aws_region: str = "ap-south-1"
 
     s3_bucket_name: str
+    s3_presigned_url_cache_seconds: int = 300
+    s3_max_pool_connections: int = 32
+
+    default_country_code: str = "91"
+    sms_concurrency: int = 10
 
     @property
     def db_url(self) -> str:
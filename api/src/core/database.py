@@ -4,13 +4,16 @@
 Async database configuration and session management
 Uses SQLAlchemy 2.x async engine and sessions
 """
+import asyncio
+import importlib
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
+from weakref import WeakKeyDictionary
 
 from sqlalchemy.ext.asyncio import (
     AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 )
-from sqlalchemy.pool import NullPool, QueuePool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from src.core.config import settings
 from src.core.logging import get_logger
@@ -21,84 +24,154 @@ logger = get_logger(__name__)
 class DatabaseManager:
     """
     Database manager for handling async SQLAlchemy engine and sessions
-    Implements singleton pattern to ensure single engine instance
+    Keeps one engine per event loop so connections never cross loops.
+    Only the application's main loop gets a connection pool; other loops
+    (asyncio.run in tasks, scripts, tests) use NullPool engines held by
+    weak reference, so a finished loop leaves no connections behind.
+    Calls made outside any loop (Alembic env, sync scripts) get the main engine
     """
 
-    _engine: AsyncEngine | None = None
-    _session_factory: async_sessionmaker[AsyncSession] | None = None
+    _main_loop: Optional[asyncio.AbstractEventLoop] = None
+    _main_engine: Optional[AsyncEngine] = None
+    _main_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+    _engines: "WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncEngine]" = WeakKeyDictionary()
+    _session_factories: "WeakKeyDictionary[asyncio.AbstractEventLoop, async_sessionmaker[AsyncSession]]" = WeakKeyDictionary()
+
+    @staticmethod
+    def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+        """The running event loop, or None when called outside one"""
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
 
     @classmethod
-    def get_engine(cls) -> AsyncEngine:
+    def _is_main(cls, loop: Optional[asyncio.AbstractEventLoop]) -> bool:
+        """Whether a loop uses the main engine; sync callers share it too"""
+        return loop is None or loop is cls._main_loop
+
+    @classmethod
+    def set_main_loop(cls) -> None:
         """
-        Get or create async database engine
-        Configured with connection pooling for production
+        Mark the running loop as the application's main loop
+        Call this once from the application lifespan before using the database
         """
-        if cls._engine is None:
-            logger.info("Creating database engine", url=settings.db_name)
+        cls._main_loop = asyncio.get_running_loop()
 
-            # Choose pool class based on environment
-            if settings.is_production:
-                pool_class = QueuePool
-            else:
-                pool_class = NullPool if settings.debug else QueuePool
-
-            if pool_class is NullPool:
-                cls._engine = create_async_engine(
-                    settings.db_url,
-                    echo=settings.db_echo,
-                    future=True,
-                )
-            else:
-                cls._engine = create_async_engine(
-                    settings.db_url,
-                    echo=settings.db_echo,
-                    future=True,
-                    pool_size=settings.db_pool_size,
-                    max_overflow=settings.db_max_overflow,
-                    pool_timeout=settings.db_pool_timeout,
-                    pool_recycle=settings.db_pool_recycle,
-                    pool_pre_ping=True,
-                    poolclass=pool_class,
-                )
-
-            logger.info(
-                "Database engine created",
-                pool_size=settings.db_pool_size,
-                max_overflow=settings.db_max_overflow
+    @classmethod
+    def _create_engine(cls, pooled: bool) -> AsyncEngine:
+        """Create an async engine, with a connection pool if requested"""
+        logger.info("Creating database engine", url=settings.db_name, pooled=pooled)
+
+        # Larger prepared statement cache for hot queries; Postgres JIT
+        # only adds planning overhead to short OLTP queries
+        connect_args = {
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+            "server_settings": {"jit": "off"},
+        }
+
+        if not pooled:
+            return create_async_engine(
+                settings.db_url,
+                echo=settings.db_echo,
+                future=True,
+                connect_args=connect_args,
+                poolclass=NullPool,
             )
 
-        return cls._engine
+        engine = create_async_engine(
+            settings.db_url,
+            echo=settings.db_echo,
+            future=True,
+            connect_args=connect_args,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=True,
+            # Reuse the most recent connection so idle ones can expire
+            pool_use_lifo=True,
+            poolclass=AsyncAdaptedQueuePool,
+        )
+
+        logger.info(
+            "Database engine created",
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow
+        )
+
+        return engine
+
+    @classmethod
+    def get_engine(cls) -> AsyncEngine:
+        """
+        Get or create async database engine for the running event loop
+        Configured with connection pooling on the main loop
+        """
+        loop = cls._running_loop()
+
+        if cls._is_main(loop):
+            if cls._main_engine is None:
+                # Debug runs in development skip pooling entirely
+                pooled = settings.is_production or not settings.debug
+                cls._main_engine = cls._create_engine(pooled=pooled)
+            return cls._main_engine
+
+        engine = cls._engines.get(loop)
+        if engine is None:
+            engine = cls._create_engine(pooled=False)
+            cls._engines[loop] = engine
+
+        return engine
     
     @classmethod
     def get_session_factory(cls) -> async_sessionmaker[AsyncSession]:
         """
-        Get or create async session factory
+        Get or create async session factory for the running event loop
         """
-        if cls._session_factory is None:
+        loop = cls._running_loop()
+        is_main = cls._is_main(loop)
+        session_factory = cls._main_session_factory if is_main else cls._session_factories.get(loop)
+
+        if session_factory is None:
             engine = cls.get_engine()
-            cls._session_factory = async_sessionmaker(
+            session_factory = async_sessionmaker(
                 engine,
                 class_=AsyncSession,
                 expire_on_commit=False,
                 autocommit=False,
                 autoflush=False,
             )
+            if is_main:
+                cls._main_session_factory = session_factory
+            else:
+                cls._session_factories[loop] = session_factory
             logger.info("Session factory created")
 
-        return cls._session_factory
+        return session_factory
     
     @classmethod
     async def close(cls) -> None:
         """
-        Close database engine and cleanup resources
+        Close all database engines and cleanup resources
         Call this on application shutdown
         """
-        if cls._engine is not None:
-            logger.info("Closing database engine")
-            await cls._engine.dispose()
-            cls._engine = None
-            cls._session_factory = None
-            logger.info("Database engine closed")
+        engines = list(cls._engines.values())
+        if cls._main_engine is not None:
+            engines.append(cls._main_engine)
+
+        cls._main_loop = None
+        cls._main_engine = None
+        cls._main_session_factory = None
+        cls._engines.clear()
+        cls._session_factories.clear()
+
+        if engines:
+            logger.info("Closing database engines", count=len(engines))
+            await asyncio.gather(
+                *(engine.dispose() for engine in engines), return_exceptions=True
+            )
+            logger.info("Database engines closed")
 
 
 # Convinience functions
@@ -175,6 +248,32 @@ async def init_db() -> None:
     logger.info("Database initialized successfully")
 
 
+async def warmup_pool() -> None:
+    """
+    Pre-populate the connection pool so the first requests
+    don't pay connection setup latency
+    """
+    engine = get_engine()
+
+    if isinstance(engine.pool, NullPool):
+        return
+
+    # Hold all connections at once so the pool opens db_pool_size of them;
+    # every connection that did open is returned even if others failed
+    results = await asyncio.gather(
+        *(engine.connect().start() for _ in range(settings.db_pool_size)),
+        return_exceptions=True,
+    )
+    connections = [conn for conn in results if not isinstance(conn, BaseException)]
+    await asyncio.gather(*(conn.close() for conn in connections), return_exceptions=True)
+
+    errors = [error for error in results if isinstance(error, BaseException)]
+    if errors:
+        raise errors[0]
+
+    logger.info("Database connection pool warmed up", connections=settings.db_pool_size)
+
+
 async def drop_db() -> None:
     """
     Drop all database tables
@@ -191,22 +290,25 @@ async def drop_db() -> None:
     logger.info("All database tables dropped")
 
 
+# Model modules that must be imported so SQLAlchemy knows about all tables
+MODEL_MODULES = (
+    "src.apps.authentication.models",
+    "src.apps.users.models",
+    "src.apps.restaurants.models",
+    "src.apps.orders.models",
+    "src.apps.delivery.models",
+    "src.apps.payments.models",
+    "src.apps.notifications.models",
+    "src.apps.analytics.models",
+    "src.apps.ai_services.models",
+    "src.apps.admin.models",
+)
+
+
 def import_all_models() -> None:
     """
     Import all mdoels to ensure they're registered with SQLAlchemy
     This is necessary for migrations and table creation
     """
-    # Import all model modules here
-    # This ensures SQLAlchemy knows about all tables
-    from src.apps.authentication import models as auth_models
-    from src.apps.users import models as user_models
-    from src.apps.restaurants import models as restaurant_models
-    from src.apps.orders import models as order_models
-    from src.apps.delivery import models as delivery_models
-    from src.apps.payments import models as payment_models
-    from src.apps.notifications import models as notification_models
-    from src.apps.analytics import models as analytics_models
-    from src.apps.ai_services import models as ai_models
-    from src.apps.admin import models as admin_models
-
-
+    for module in MODEL_MODULES:
+        importlib.import_module(module)
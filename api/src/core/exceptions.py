@@ -10,11 +10,18 @@ class AppException(Exception):
     """
     Base exception for all application errors
     All custom exceptions should inherit from this class
+
+    Subclasses set error_code and default_message as class attributes
+    instead of overriding __init__ just to change them
     """
-    
-    def __init__(self, message: str, error_code: str = "APP_ERROR"):
-        self.message = message
-        self.error_code = error_code
+
+    error_code: str = "APP_ERROR"
+    default_message: str = "Application error"
+
+    def __init__(self, message: str = None, error_code: str = None):
+        self.message = self.default_message if message is None else message
+        if error_code is not None:
+            self.error_code = error_code
         super().__init__(self.message)
     
     def __str__(self):
@@ -30,48 +37,44 @@ class AppException(Exception):
 
 class AuthenticationError(AppException):
     """Raised when authentication fails"""
-    
-    def __init__(self, message: str = "Authentication failed"):
-        super().__init__(message, "AUTH_ERROR")
+
+    error_code = "AUTH_ERROR"
+    default_message = "Authentication failed"
 
 
 class InvalidCredentialsError(AuthenticationError):
     """Raised when credentials are invalid"""
-    
-    def __init__(self, message: str = "Invalid credentials"):
-        super().__init__(message)
-        self.error_code = "INVALID_CREDENTIALS"
+
+    error_code = "INVALID_CREDENTIALS"
+    default_message = "Invalid credentials"
 
 
 class TokenExpiredError(AuthenticationError):
     """Raised when token has expired"""
-    
-    def __init__(self, message: str = "Token has expired"):
-        super().__init__(message)
-        self.error_code = "TOKEN_EXPIRED"
+
+    error_code = "TOKEN_EXPIRED"
+    default_message = "Token has expired"
 
 
 class InvalidTokenError(AuthenticationError):
     """Raised when token is invalid"""
-    
-    def __init__(self, message: str = "Invalid token"):
-        super().__init__(message)
-        self.error_code = "INVALID_TOKEN"
+
+    error_code = "INVALID_TOKEN"
+    default_message = "Invalid token"
 
 
 class AuthorizationError(AppException):
     """Raised when user doesn't have permission"""
-    
-    def __init__(self, message: str = "Insufficient permissions"):
-        super().__init__(message, "AUTHORIZATION_ERROR")
+
+    error_code = "AUTHORIZATION_ERROR"
+    default_message = "Insufficient permissions"
 
 
 class InsufficientPermissionsError(AuthorizationError):
     """Raised when user lacks required permissions"""
-    
-    def __init__(self, message: str = "You don't have permission to perform this action"):
-        super().__init__(message)
-        self.error_code = "INSUFFICIENT_PERMISSIONS"
+
+    error_code = "INSUFFICIENT_PERMISSIONS"
+    default_message = "You don't have permission to perform this action"
 
 
 # ============================================================================
@@ -80,31 +83,35 @@ class InsufficientPermissionsError(AuthorizationError):
 
 class NotFoundError(AppException):
     """Raised when a resource is not found"""
-    
+
+    error_code = "NOT_FOUND"
+
     def __init__(self, resource: str = "Resource", resource_id: str = None):
         if resource_id:
             message = f"{resource} with ID '{resource_id}' not found"
         else:
             message = f"{resource} not found"
-        super().__init__(message, "NOT_FOUND")
+        super().__init__(message)
 
 
 class AlreadyExistsError(AppException):
     """Raised when trying to create a resource that already exists"""
-    
+
+    error_code = "ALREADY_EXISTS"
+
     def __init__(self, resource: str = "Resource", identifier: str = None):
         if identifier:
             message = f"{resource} with identifier '{identifier}' already exists"
         else:
             message = f"{resource} already exists"
-        super().__init__(message, "ALREADY_EXISTS")
+        super().__init__(message)
 
 
 class ConflictError(AppException):
     """Raised when there's a conflict with current state"""
-    
-    def __init__(self, message: str = "Resource conflict"):
-        super().__init__(message, "CONFLICT")
+
+    error_code = "CONFLICT"
+    default_message = "Resource conflict"
 
 
 # ============================================================================
@@ -113,27 +120,32 @@ class ConflictError(AppException):
 
 class ValidationError(AppException):
     """Raised when data validation fails"""
-    
-    def __init__(self, message: str = "Validation failed", field: str = None):
+
+    error_code = "VALIDATION_ERROR"
+    default_message = "Validation failed"
+
+    def __init__(self, message: str = None, field: str = None):
+        if message is None:
+            message = self.default_message
         if field:
             message = f"Validation failed for field '{field}': {message}"
-        super().__init__(message, "VALIDATION_ERROR")
+        super().__init__(message)
 
 
 class InvalidInputError(ValidationError):
     """Raised when input data is invalid"""
-    
-    def __init__(self, message: str = "Invalid input", field: str = None):
-        super().__init__(message, field)
-        self.error_code = "INVALID_INPUT"
+
+    error_code = "INVALID_INPUT"
+    default_message = "Invalid input"
 
 
 class MissingFieldError(ValidationError):
     """Raised when a required field is missing"""
-    
+
+    error_code = "MISSING_FIELD"
+
     def __init__(self, field: str):
         super().__init__(f"Required field '{field}' is missing")
-        self.error_code = "MISSING_FIELD"
 
 
 # ============================================================================
@@ -142,49 +154,46 @@ class MissingFieldError(ValidationError):
 
 class BusinessLogicError(AppException):
     """Raised when business logic validation fails"""
-    
-    def __init__(self, message: str = "Business logic error"):
-        super().__init__(message, "BUSINESS_LOGIC_ERROR")
+
+    error_code = "BUSINESS_LOGIC_ERROR"
+    default_message = "Business logic error"
 
 
 class InsufficientBalanceError(BusinessLogicError):
     """Raised when account has insufficient balance"""
-    
-    def __init__(self, message: str = "Insufficient balance"):
-        super().__init__(message)
-        self.error_code = "INSUFFICIENT_BALANCE"
+
+    error_code = "INSUFFICIENT_BALANCE"
+    default_message = "Insufficient balance"
 
 
 class OrderNotAllowedError(BusinessLogicError):
     """Raised when order operation is not allowed"""
-    
-    def __init__(self, message: str = "Order operation not allowed"):
-        super().__init__(message)
-        self.error_code = "ORDER_NOT_ALLOWED"
+
+    error_code = "ORDER_NOT_ALLOWED"
+    default_message = "Order operation not allowed"
 
 
 class DeliveryNotAvailableError(BusinessLogicError):
     """Raised when delivery is not available"""
-    
-    def __init__(self, message: str = "Delivery not available in this area"):
-        super().__init__(message)
-        self.error_code = "DELIVERY_NOT_AVAILABLE"
+
+    error_code = "DELIVERY_NOT_AVAILABLE"
+    default_message = "Delivery not available in this area"
 
 
 class RestaurantClosedError(BusinessLogicError):
     """Raised when restaurant is closed"""
-    
-    def __init__(self, message: str = "Restaurant is currently closed"):
-        super().__init__(message)
-        self.error_code = "RESTAURANT_CLOSED"
+
+    error_code = "RESTAURANT_CLOSED"
+    default_message = "Restaurant is currently closed"
 
 
 class ItemOutOfStockError(BusinessLogicError):
     """Raised when menu item is out of stock"""
-    
+
+    error_code = "ITEM_OUT_OF_STOCK"
+
     def __init__(self, item_name: str = "Item"):
         super().__init__(f"{item_name} is currently out of stock")
-        self.error_code = "ITEM_OUT_OF_STOCK"
 
 
 # ============================================================================
@@ -193,25 +202,23 @@ class ItemOutOfStockError(BusinessLogicError):
 
 class DatabaseError(AppException):
     """Raised when database operation fails"""
-    
-    def __init__(self, message: str = "Database error occurred"):
-        super().__init__(message, "DATABASE_ERROR")
+
+    error_code = "DATABASE_ERROR"
+    default_message = "Database error occurred"
 
 
 class DatabaseConnectionError(DatabaseError):
     """Raised when database connection fails"""
-    
-    def __init__(self, message: str = "Failed to connect to database"):
-        super().__init__(message)
-        self.error_code = "DB_CONNECTION_ERROR"
+
+    error_code = "DB_CONNECTION_ERROR"
+    default_message = "Failed to connect to database"
 
 
 class TransactionError(DatabaseError):
     """Raised when transaction fails"""
-    
-    def __init__(self, message: str = "Transaction failed"):
-        super().__init__(message)
-        self.error_code = "TRANSACTION_ERROR"
+
+    error_code = "TRANSACTION_ERROR"
+    default_message = "Transaction failed"
 
 
 # ============================================================================
@@ -220,45 +227,51 @@ class TransactionError(DatabaseError):
 
 class ExternalServiceError(AppException):
     """Raised when external service call fails"""
-    
+
+    error_code = "EXTERNAL_SERVICE_ERROR"
+
     def __init__(self, service: str = "External service", message: str = None):
         if message:
             full_message = f"{service} error: {message}"
         else:
             full_message = f"{service} is unavailable"
-        super().__init__(full_message, "EXTERNAL_SERVICE_ERROR")
+        super().__init__(full_message)
 
 
 class PaymentGatewayError(ExternalServiceError):
     """Raised when payment gateway fails"""
-    
+
+    error_code = "PAYMENT_GATEWAY_ERROR"
+
     def __init__(self, message: str = "Payment processing failed"):
         super().__init__("Payment gateway", message)
-        self.error_code = "PAYMENT_GATEWAY_ERROR"
 
 
 class DeliveryProviderError(ExternalServiceError):
     """Raised when delivery provider API fails"""
-    
+
+    error_code = "DELIVERY_PROVIDER_ERROR"
+
     def __init__(self, provider: str = "Delivery provider", message: str = None):
         super().__init__(provider, message)
-        self.error_code = "DELIVERY_PROVIDER_ERROR"
 
 
 class SMSServiceError(ExternalServiceError):
     """Raised when SMS service fails"""
-    
+
+    error_code = "SMS_SERVICE_ERROR"
+
     def __init__(self, message: str = "Failed to send SMS"):
         super().__init__("SMS service", message)
-        self.error_code = "SMS_SERVICE_ERROR"
 
 
 class EmailServiceError(ExternalServiceError):
     """Raised when email service fails"""
-    
+
+    error_code = "EMAIL_SERVICE_ERROR"
+
     def __init__(self, message: str = "Failed to send email"):
         super().__init__("Email service", message)
-        self.error_code = "EMAIL_SERVICE_ERROR"
 
 
 # ============================================================================
@@ -267,9 +280,9 @@ class EmailServiceError(ExternalServiceError):
 
 class RateLimitExceededError(AppException):
     """Raised when rate limit is exceeded"""
-    
-    def __init__(self, message: str = "Rate limit exceeded. Please try again later."):
-        super().__init__(message, "RATE_LIMIT_EXCEEDED")
+
+    error_code = "RATE_LIMIT_EXCEEDED"
+    default_message = "Rate limit exceeded. Please try again later."
 
 
 # ============================================================================
@@ -278,27 +291,29 @@ class RateLimitExceededError(AppException):
 
 class FileUploadError(AppException):
     """Raised when file upload fails"""
-    
-    def __init__(self, message: str = "File upload failed"):
-        super().__init__(message, "FILE_UPLOAD_ERROR")
+
+    error_code = "FILE_UPLOAD_ERROR"
+    default_message = "File upload failed"
 
 
 class FileTooLargeError(FileUploadError):
     """Raised when uploaded file is too large"""
-    
+
+    error_code = "FILE_TOO_LARGE"
+
     def __init__(self, max_size: int):
         super().__init__(f"File size exceeds maximum allowed size of {max_size} bytes")
-        self.error_code = "FILE_TOO_LARGE"
 
 
 class InvalidFileTypeError(FileUploadError):
     """Raised when file type is not allowed"""
-    
+
+    error_code = "INVALID_FILE_TYPE"
+
     def __init__(self, file_type: str, allowed_types: list[str]):
         super().__init__(
             f"File type '{file_type}' is not allowed. Allowed types: {', '.join(allowed_types)}"
         )
-        self.error_code = "INVALID_FILE_TYPE"
 
 
 # ============================================================================
@@ -321,18 +336,16 @@ class UserNotFoundError(NotFoundError):
 
 class UserInactiveError(BusinessLogicError):
     """Raised when user account is inactive"""
-    
-    def __init__(self, message: str = "User account is inactive"):
-        super().__init__(message)
-        self.error_code = "USER_INACTIVE"
+
+    error_code = "USER_INACTIVE"
+    default_message = "User account is inactive"
 
 
 class UserBlockedError(BusinessLogicError):
     """Raised when user account is blocked"""
-    
-    def __init__(self, message: str = "User account has been blocked"):
-        super().__init__(message)
-        self.error_code = "USER_BLOCKED"
+
+    error_code = "USER_BLOCKED"
+    default_message = "User account has been blocked"
 
 
 # ============================================================================
@@ -348,12 +361,13 @@ class OrderNotFoundError(NotFoundError):
 
 class InvalidOrderStatusError(BusinessLogicError):
     """Raised when order status transition is invalid"""
-    
+
+    error_code = "INVALID_ORDER_STATUS"
+
     def __init__(self, current_status: str, new_status: str):
         super().__init__(
             f"Cannot change order status from '{current_status}' to '{new_status}'"
         )
-        self.error_code = "INVALID_ORDER_STATUS"
 
 
 # ============================================================================
@@ -369,7 +383,6 @@ class RestaurantNotFoundError(NotFoundError):
 
 class RestaurantNotActiveError(BusinessLogicError):
     """Raised when restaurant is not active"""
-    
-    def __init__(self, message: str = "Restaurant is not currently active"):
-        super().__init__(message)
-        self.error_code = "RESTAURANT_NOT_ACTIVE"
\ No newline at end of file
+
+    error_code = "RESTAURANT_NOT_ACTIVE"
+    default_message = "Restaurant is not currently active"
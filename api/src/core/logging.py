@@ -4,33 +4,48 @@
 Centralized logging using structlog
 Provides structured JSON logging for production and readable console logs for development
 """
+import asyncio
 import logging
+import os
 import sys
+from time import perf_counter
 from typing import Any
 
+import orjson
 import structlog
 from structlog.types import EventDict, Processor
 
 from src.core.config import settings
 
 
+# Keys whose values are never written to logs
+SENSITIVE_KEYS = frozenset({
+    "password", "token", "api_key", "secret", "authorization",
+    "refresh_token", "access_token", "session_id", "card_number",
+    "cvv", "pin"
+})
+CENSORED_VALUE = "***CENSORED***"
+
+
 def add_app_context(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
     """
     Add application context to log entries.
-    Extracts file, line number, and function name from call stack.
+    Copies file, line number, and function name from the LogRecord,
+    whose caller lookup the stdlib logger has already done.
     """
-    import structlog._frames
-
-    frame, name = structlog._frames._find_first_app_frame_and_name(
-        additional_ignores=["logging", __name__]
-    )
+    record = event_dict.get("_record")
 
-    event_dict["file"] = frame.f_code.co_filename.split("/")[-1]
-    event_dict["line"] = frame.f_lineno
-    event_dict["function"] = frame.f_code.co_name
+    if record is not None:
+        event_dict["file"] = record.filename
+        event_dict["line"] = record.lineno
+        event_dict["function"] = record.funcName
 
     return event_dict
 
+def _orjson_dumps(obj: Any, default: Any = None, **kwargs: Any) -> str:
+    """Serialize a log event with orjson (the formatter expects a str)"""
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+
 def drop_color_message_key(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
     """
     Drop 'color_message' key added by Uvicorn
@@ -39,30 +54,84 @@ def drop_color_message_key(logger: Any, method_name: str, event_dict: EventDict)
     event_dict.pop("color_message", None)
     return event_dict
 
+def _censor_dict(d: dict) -> dict:
+    """Censor a dictionary, copying it only when a sensitive value is found"""
+    censored = None
+    for key, value in d.items():
+        if isinstance(value, dict):
+            new_value = _censor_dict(value)
+            if new_value is value:
+                continue
+        elif key in SENSITIVE_KEYS or key.lower() in SENSITIVE_KEYS:
+            new_value = CENSORED_VALUE
+        else:
+            continue
+
+        if censored is None:
+            censored = dict(d)
+        censored[key] = new_value
+
+    return d if censored is None else censored
+
 def censor_sensitive_data(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
     """
     Censor sensitive data in logs.
     Replaces passwords, tokens, and API keys with asterisks.
     """
-    sensitive_keys = {
-        "password", "token", "api_key", "secret", "authorization",
-        "refresh_token", "access_token", "session_id", "card_number",
-        "cvv", "pin"
-    }
-
-    def censor_dict(d: dict) -> dict:
-        """Recursively censor dictionary values"""
-        censored = {}
-        for key, value in d.items():
-            if isinstance(value, dict):
-                censored[key] = censor_dict(value)
-            elif key.lower() in sensitive_keys:
-                censored[key] = "***CENSORED***"
-            else:
-                censored[key] = value
-        return censored
-    
-    return censor_dict(event_dict)
+    return _censor_dict(event_dict)
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """
+    Stream handler that leaves flushing to a periodic task
+    Records at or above flush_level are flushed immediately
+    """
+
+    def __init__(self, stream=None, flush_level: int = logging.ERROR):
+        super().__init__(stream)
+        self.flush_level = flush_level
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= self.flush_level:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+def _open_log_stream():
+    """
+    Open stdout with a large write buffer
+    Falls back to sys.stdout when it isn't backed by a file descriptor
+    """
+    try:
+        fileno = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        return sys.stdout
+
+    return open(
+        fileno,
+        "w",
+        buffering=settings.log_buffer_size,
+        encoding=sys.stdout.encoding or "utf-8",
+        errors="backslashreplace",
+        closefd=False,
+    )
+
+
+def flush_logs() -> None:
+    """Flush buffered log output of all root handlers"""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
+async def run_log_flush() -> None:
+    """Flush buffered log output every log_flush_interval seconds"""
+    while True:
+        await asyncio.sleep(settings.log_flush_interval)
+        flush_logs()
 
 def setup_logging() -> None:
     """
@@ -91,22 +160,28 @@ def setup_logging() -> None:
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_log_level,
         structlog.stdlib.add_logger_name,
-        structlog.stdlib.PositionalArgumentsFormatter(),
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
-        drop_color_message_key,
         censor_sensitive_data,
     ]
 
-    # Add file/line info in development
-    if settings.is_development:
-        shared_processors.append(add_app_context)
+    # Only structlog calls carry positional args, and only
+    # stdlib records (uvicorn) carry a color_message
+    structlog_processors: list[Processor] = [
+        structlog.stdlib.filter_by_level,
+        structlog.stdlib.PositionalArgumentsFormatter(),
+        *shared_processors,
+    ]
+    foreign_processors: list[Processor] = [
+        drop_color_message_key,
+        *shared_processors,
+    ]
 
     # Choose renderer based on environment
     if settings.log_format == "json" or settings.is_production:
         # JSON renderer for production
-        renderer = structlog.processors.JSONRenderer()
+        renderer = structlog.processors.JSONRenderer(serializer=_orjson_dumps)
     else:
         # Console renderer for development
         renderer = structlog.dev.ConsoleRenderer(
@@ -116,8 +191,7 @@ def setup_logging() -> None:
     # Configure structlog
     structlog.configure(
         processors=[
-            structlog.stdlib.filter_by_level,
-            *shared_processors,
+            *structlog_processors,
             structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
         logger_factory=structlog.stdlib.LoggerFactory(),
@@ -126,17 +200,26 @@ def setup_logging() -> None:
         cache_logger_on_first_use=True,
     )
 
+    # Add file/line info in development, from the record being formatted
+    formatter_processors: list[Processor] = []
+    if settings.is_development:
+        formatter_processors.append(add_app_context)
+
     # Configure ProcessorFormatter for standard logging
     formatter = structlog.stdlib.ProcessorFormatter(
-        foreign_pre_chain=shared_processors,
+        foreign_pre_chain=foreign_processors,
         processors=[
+            *formatter_processors,
             structlog.stdlib.ProcessorFormatter.remove_processors_meta,
             renderer,
         ]
     )
 
-    # Apply formatter to all handlers
-    handler = logging.StreamHandler(sys.stdout)
+    # Apply formatter to all handlers; buffer output unless disabled
+    if settings.log_buffer_size > 0:
+        handler = BufferedStreamHandler(_open_log_stream())
+    else:
+        handler = logging.StreamHandler(sys.stdout)
     handler.setFormatter(formatter)
     logger.handlers = [handler]
 
@@ -170,25 +253,32 @@ def get_logger(name: str = None) -> structlog.stdlib.BoundLogger:
 class LoggingMiddleware:
     """
     Middleware for logging HTTP requests and responses
-    Adds correlation ID and request context to all logs
+    Adds correlation ID and request context to all logs,
+    and the X-Process-Time header to responses
     """
 
     def __init__(self, app):
         self.app = app
+        self.logger = get_logger(__name__)
+        # Probe endpoints (health checks, metrics) are not logged in production
+        self.skip_paths = (
+            frozenset(settings.log_skip_paths) if settings.is_production else frozenset()
+        )
 
     async def __call__(self, scope, receive, send):
         if scope["type"] != "http":
             await self.app(scope, receive, send)
             return
-        
-        import uuid
-        from time import time
+
+        if scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
 
         # Generate correlation ID
-        correlation_id = str(uuid.uuid4())
+        correlation_id = os.urandom(16).hex()
 
-        # Bind request context to logs
-        structlog.contextvars.clear_contextvars()
+        # Bind request context to logs; each request runs in its own
+        # context, so there is nothing left over from earlier requests to clear
         structlog.contextvars.bind_contextvars(
             correlation_id=correlation_id,
             path=scope["path"],
@@ -196,53 +286,52 @@ class LoggingMiddleware:
             client_host=scope["client"][0] if scope.get("client") else None,
         )
 
-        # Get logger
-        logger = get_logger(__name__)
+        logger = self.logger
 
         # Record start time
-        start_time = time()
+        start_time = perf_counter()
+        status_code = 0
 
         # Process request
         async def send_wrapper(message):
+            nonlocal status_code
+
             if message["type"] == "http.response.start":
                 # Bind response status
-                structlog.contextvars.bind_contextvars(
-                    status_code=message["status"]
-                )
+                status_code = message["status"]
+                structlog.contextvars.bind_contextvars(status_code=status_code)
+
+                # Add processing time to response headers
+                process_time = str(perf_counter() - start_time).encode("latin-1")
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"x-process-time", process_time),
+                ]
 
             await send(message)
 
         try:
             await self.app(scope, receive, send_wrapper)
-        except Exception as e:
-            logger.error(
-                "Request failed",
-                error=str(e),
-                error_type=type(e).__name__,
-                duration=time() - start_time,
-            )
+        except Exception:
+            # Logged with its traceback by the general exception handler,
+            # which sends the 500 response outside this middleware; a
+            # response that already started keeps the status it was sent with
+            if not status_code:
+                status_code = 500
             raise
         finally:
-            # Log request completion
-            duration = time() - start_time
-            status_code = structlog.contextvars.get_contextvars().get("status_code", 0)
-
             # Determine log level based on status code
             if status_code >= 500:
-                log_func = logger.error
+                level = logging.ERROR
             elif status_code >= 400:
-                log_func = logger.warning
+                level = logging.WARNING
             else:
-                log_func = logger.info
-
-            # Skip health check logs in production
-            if settings.is_production and scope["path"] in ["/health", "/healthz"]:
-                return
-            
-            log_func(
-                "Request completed",
-                duration=f"{duration:.3f}s",
-            )
-
-
-            
\ No newline at end of file
+                level = logging.INFO
+
+            # Build nothing for records the level filter would drop anyway
+            if logger.isEnabledFor(level):
+                logger.log(
+                    level,
+                    "Request completed",
+                    duration_ms=(perf_counter() - start_time) * 1000,
+                )
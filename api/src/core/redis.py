@@ -118,6 +118,32 @@ class RedisService:
             logger.error("Redis SET failed", key=key, error=str(e))
             return False
         
+    async def set_many(
+        self, mapping: dict[str, Any], expire: Optional[int] = None, serialize: bool = True
+    ) -> bool:
+        """
+        Set multiple values in a single pipelined round-trip
+
+        Args:
+            mapping: Dictionary of Redis keys to values
+            expire: Expiration time in seconds
+            serialize: Whether to JSON serialize the values
+        """
+        try:
+            client = await self._get_client()
+
+            async with client.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    if serialize and not isinstance(value, (str, bytes)):
+                        value = json.dumps(value)
+                    pipe.set(key, value, ex=expire)
+                await pipe.execute()
+
+            return True
+        except RedisError as e:
+            logger.error("Redis pipelined SET failed", keys=len(mapping), error=str(e))
+            return False
+
     async def get(
         self, key: str, deserialize: bool = True
     ) -> Optional[Any]:
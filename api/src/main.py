@@ -5,28 +5,45 @@ Main FastAPI Application Entry Point
 Initializes the application with all middleware, routers, and event handlers.
 """
 
+import asyncio
+import contextlib
 import time
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import Any
 
-from fastapi import FastAPI, Request, status
+from fastapi import APIRouter, FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
+import orjson
+from sqlalchemy import text
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from src.core.config import settings
-from src.core.database import DatabaseManager
+from src.core.database import (
+    DatabaseManager, get_db_context, get_engine, warmup_pool
+)
 from src.core.exceptions import AppException
-from src.core.logging import LoggingMiddleware, get_logger, setup_logging
-from src.core.redis import RedisManager
+from src.core.logging import (
+    LoggingMiddleware, flush_logs, get_logger, run_log_flush, setup_logging
+)
+from src.core.redis import RedisManager, redis_service
 
 # Initialize logging first
 setup_logging()
 logger = get_logger(__name__)
 
+# Static application details, read from settings once
+APP_INFO = {
+    "application": settings.app_name,
+    "version": settings.app_version,
+    "environment": settings.environment,
+}
+IS_PRODUCTION = settings.is_production
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -42,18 +59,29 @@ async def lifespan(app: FastAPI):
         environment=settings.environment,
     )
 
+    # uvicorn picks uvloop when it is installed (uvicorn[standard])
+    loop_module = type(asyncio.get_running_loop()).__module__
+    if not loop_module.startswith("uvloop"):
+        logger.warning("uvloop is not active", event_loop=loop_module)
+
     # Initialize database
     try:
-        from src.core.database import get_engine
+        DatabaseManager.set_main_loop()
         engine = get_engine()
         logger.info("Database engine initialized")
     except Exception as e:
         logger.error("Failed to initialize database", error=str(e))
         raise
 
+    # An unreachable database shouldn't stop startup; connections
+    # are then opened on demand by the first requests
+    try:
+        await warmup_pool()
+    except Exception as e:
+        logger.warning("Database connection pool warmup failed", error=str(e))
+
     # Initialize Redis
     try:
-        from src.core.redis import RedisManager
         redis_client = await RedisManager.get_client()
         is_connected = await redis_client.ping()
         if is_connected:
@@ -65,6 +93,15 @@ async def lifespan(app: FastAPI):
         logger.error("Failed to connect to Redis", error=str(e))
         raise
 
+    # Flush buffered log output periodically
+    log_flush_task = None
+    if settings.log_buffer_size > 0:
+        log_flush_task = asyncio.create_task(run_log_flush())
+
+    # Build the OpenAPI schema now so the first docs request doesn't wait for it
+    if app.openapi_url:
+        app.openapi()
+
     logger.info("Application startup completed")
 
     yield
@@ -82,15 +119,23 @@ async def lifespan(app: FastAPI):
 
     logger.info("Application shutdown completed")
 
+    # Stop the periodic flusher, then drain everything logged during shutdown
+    if log_flush_task is not None:
+        log_flush_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await log_flush_task
+    flush_logs()
+
 
 # Create FastAPI application
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="Production grade Restaurant Fleet Management Platform",
-    docs_url="/docs" if not settings.is_production else None,
-    redoc_url="/redoc" if not settings.is_production else None,
-    openapi_url="/openapi.json" if not settings.is_production else None,
+    docs_url="/docs" if not IS_PRODUCTION else None,
+    redoc_url="/redoc" if not IS_PRODUCTION else None,
+    openapi_url="/openapi.json" if not IS_PRODUCTION else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -111,7 +156,7 @@ app.add_middleware(
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 # Trusted Host Middleware (production)
-if settings.is_production:
+if IS_PRODUCTION:
     app.add_middleware(
         TrustedHostMiddleware,
         allowed_hosts=["*"], # Configure with actual hosts in production
@@ -134,7 +179,7 @@ async def app_exception_handler(request: Request, exc: AppException):
         path=request.url.path,
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_400_BAD_REQUEST,
         content={
             "success": False,
@@ -155,7 +200,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
         path=request.url.path,
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
@@ -169,19 +214,21 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle request validation errors"""
+    errors = exc.errors()
+
     logger.warning(
         "Validation error",
-        errors=exc.errors(),
+        errors=errors,
         path=request.url.path,
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
         content={
             "success": False,
             "error_code": "VALIDATION_ERROR",
             "message": "Request validation failed",
-            "details": exc.errors(),
+            "details": errors,
         }
     )
 
@@ -197,12 +244,12 @@ async def general_exception_handler(request: Request, exc: Exception):
     )
 
     # Don't expose internal errors in production
-    if settings.is_production:
+    if IS_PRODUCTION:
         message = "An internal server error occurred."
     else:
         message = str(exc)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "success": False,
@@ -217,18 +264,17 @@ async def general_exception_handler(request: Request, exc: Exception):
 # Health Check Endpoints
 # ==========================================================================
 
+# Liveness probe body, serialized once
+HEALTH_RESPONSE_BODY = orjson.dumps({"status": "healthy", **APP_INFO})
+
+
 @app.get("/health", tags=["Health"])
 async def health_check():
     """
     Basic health check endpoint
     Returns application status and version
     """
-    return {
-        "status": "healthy",
-        "application": settings.app_name,
-        "version": settings.app_version,
-        "environment": settings.environment,
-    }
+    return Response(content=HEALTH_RESPONSE_BODY, media_type="application/json")
 
 
 @app.get("/health/detailed", tags=["Health"])
@@ -239,19 +285,16 @@ async def detailed_health_check():
     """
     health_status = {
         "status": "healthy",
-        "application": settings.app_name,
-        "version": settings.app_version,
-        "environment": settings.environment,
+        **APP_INFO,
         "timestamp": time.time(),
         "checks": {}
     }
 
     # Check database
     try:
-        from src.core.database import get_engine
         engine = get_engine()
         async with engine.connect() as conn:
-            await conn.execute("SELECT 1")
+            await conn.execute(text("SELECT 1"))
         health_status["checks"]["database"] = {
             "status": "healthy",
             "message": "Database connection successful"
@@ -266,7 +309,6 @@ async def detailed_health_check():
 
     # Check Redis
     try:
-        from src.core.redis import RedisManager
         redis_client = await RedisManager.get_client()
         await redis_client.ping()
         health_status["checks"]["redis"] = {
@@ -288,26 +330,28 @@ async def detailed_health_check():
         else status.HTTP_503_SERVICE_UNAVAILABLE
     )
 
-    return JSONResponse(content=health_status, status_code=status_code)
+    return ORJSONResponse(content=health_status, status_code=status_code)
 
 
 # ==========================================================================
 # Root Endpoint
 # ==========================================================================
 
+# Root endpoint response never changes at runtime
+ROOT_RESPONSE_BODY = orjson.dumps({
+    **APP_INFO,
+    "documentation": "/docs" if not IS_PRODUCTION else "Documentation disabled in production",
+    "health_check": "/health",
+    "api_prefix": settings.api_v1_prefix,
+})
+
+
 @app.get("/", tags=["Root"])
 async def root():
     """
     Root endpoint with API information
     """
-    return {
-        "application": settings.app_name,
-        "version": settings.app_version,
-        "environment": settings.environment,
-        "documentation": "/docs" if not settings.is_production else "Documentation disabled in production",
-        "health_check": "/health",
-        "api_prefix": settings.api_v1_prefix,
-    }
+    return Response(content=ROOT_RESPONSE_BODY, media_type="application/json")
 
 
 # ==========================================================================
@@ -320,7 +364,6 @@ async def root():
 # app.include_router(api_v1_router, prefix=settings.api_v1_prefix)
 
 # For now, let's add a simple test router
-from fastapi import APIRouter
 test_router = APIRouter(prefix="/api/v1/test", tags=["Test"])
 
 @test_router.get("/")
@@ -330,16 +373,13 @@ async def test_endpoint():
     return {
         "message": "Test endpoint working",
         "timestamp": time.time(),
-        "environment": settings.environment,
+        "environment": APP_INFO["environment"],
     }
 
 
 @test_router.get("/db")
 async def test_database():
     """Test database connection."""
-    from sqlalchemy import text
-    from src.core.database import get_db_context
-
     try:
         async with get_db_context() as db:
             result = await db.execute(text("SELECT 1 as test"))
@@ -352,7 +392,7 @@ async def test_database():
         }
     except Exception as e:
         logger.error("Database test failed", error=str(e))
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={
                 "message": "Database connection failed",
@@ -364,8 +404,6 @@ async def test_database():
 @test_router.get("/redis")
 async def test_redis():
     """Test Redis connection"""
-    from src.core.redis import redis_service
-
     try:
         # Set a test value
         await redis_service.set("test_key", "test_value", expire=60)
@@ -383,7 +421,7 @@ async def test_redis():
         }
     except Exception as e:
         logger.error("Redis test failed", error=str(e))
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={
                 "message": "Redis connection failed",
@@ -408,52 +446,46 @@ async def test_logging():
 # Register test router
 app.include_router(test_router)
 
-# ==========================================================================
-# Request/Response Middleware for Timing
-# ==========================================================================
-
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """Add processing time to response headers."""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
-
 # ==========================================================================
 # Development only endpoints
 # ==========================================================================
 
 if settings.is_development:
 
+    DEBUG_CONFIG = {
+        "environment": settings.environment,
+        "debug": settings.debug,
+        "database_url": settings.db_name,
+        "redis_url": settings.redis_url.split("@")[-1],  # Hide password
+        "log_level": settings.log_level,
+        "cors_origins": settings.cors_origins,
+    }
+
     @app.get("/debug/config", tags=["Debug"])
     async def debug_config():
         """
         Debug endpoint to view configuration (development only)
         WARNING: Never expose this in production!
         """
-        return {
-            "environment": settings.environment,
-            "debug": settings.debug,
-            "database_url": settings.db_name,
-            "redis_url": settings.redis_url.split("@")[-1],  # Hide password
-            "log_level": settings.log_level,
-            "cors_origins": settings.cors_origins,
-        }
+        return DEBUG_CONFIG
     
+    @lru_cache(maxsize=1)
+    def get_route_summary() -> list[dict[str, Any]]:
+        """Summarize registered routes (computed on first use, routes only change at startup)"""
+        return [
+            {
+                "path": route.path,
+                "name": route.name,
+                "methods": list(route.methods),
+            }
+            for route in app.routes
+            if hasattr(route, "methods")
+        ]
+
     @app.get("/debug/routes", tags=["Debug"])
     async def debug_routes():
         """List all registered routes (development only)"""
-        routes = []
-        for route in app.routes:
-            if hasattr(route, "methods"):
-                routes.append({
-                    "path": route.path,
-                    "name": route.name,
-                    "methods": list(route.methods),
-                })
-        return routes
+        return get_route_summary()
     
 
 if __name__ == "__main__":
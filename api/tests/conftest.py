@@ -0,0 +1,20 @@
+# tests/conftest.py
+
+"""
+Shared test configuration
+Provides placeholder values for required settings so modules can be imported
+without a .env file or any running services
+"""
+
+import os
+
+for _name, _value in {
+    "DB_NAME": "restomate_test",
+    "DB_USER": "restomate",
+    "DB_PASSWORD": "restomate",
+    "SECRET_KEY": "test-secret-key",
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "S3_BUCKET_NAME": "restomate-test",
+}.items():
+    os.environ.setdefault(_name, _value)
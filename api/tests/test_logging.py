@@ -0,0 +1,39 @@
+# tests/test_logging.py
+
+"""
+Tests for sensitive data censoring in log events
+"""
+
+from src.core.logging import CENSORED_VALUE, _censor_dict
+
+
+class TestCensorDict:
+    def test_clean_dict_is_returned_as_is(self):
+        event = {"event": "Order placed", "order": {"id": 7, "total": 12.5}}
+
+        assert _censor_dict(event) is event
+
+    def test_sensitive_keys_are_censored(self):
+        event = {"event": "Login", "password": "hunter2", "Token": "abc"}
+
+        assert _censor_dict(event) == {
+            "event": "Login", "password": CENSORED_VALUE, "Token": CENSORED_VALUE,
+        }
+
+    def test_original_is_not_modified(self):
+        event = {"event": "Login", "user": {"email": "a@b.c", "password": "hunter2"}}
+
+        censored = _censor_dict(event)
+
+        assert censored is not event
+        assert censored["user"] == {"email": "a@b.c", "password": CENSORED_VALUE}
+        assert event["user"]["password"] == "hunter2"
+
+    def test_untouched_nested_dicts_are_shared(self):
+        address = {"city": "Pune"}
+        event = {"event": "Signup", "address": address, "api_key": "k"}
+
+        censored = _censor_dict(event)
+
+        assert censored["api_key"] == CENSORED_VALUE
+        assert censored["address"] is address
@@ -0,0 +1,109 @@
+# tests/test_s3_service.py
+
+"""
+Tests for S3 Content-Disposition building and presigned URL caching
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.common import s3_service as s3_module
+from src.common.s3_service import S3Service, build_content_disposition
+
+
+class TestBuildContentDisposition:
+    def test_ascii_filename(self):
+        assert build_content_disposition("menu.pdf") == (
+            "attachment; filename=\"menu.pdf\"; filename*=UTF-8''menu.pdf"
+        )
+
+    def test_inline_disposition(self):
+        assert build_content_disposition("logo.png", "inline").startswith("inline; ")
+
+    def test_non_ascii_filename_keeps_encoded_original(self):
+        assert build_content_disposition("café 中.pdf") == (
+            "attachment; filename=\"caf? ?.pdf\"; filename*=UTF-8''caf%C3%A9%20%E4%B8%AD.pdf"
+        )
+
+    def test_control_characters_are_replaced(self):
+        value = build_content_disposition('a\r\nSet-Cookie: x\t\x00\x7f.pdf')
+
+        assert "\r" not in value and "\n" not in value
+        assert 'filename="a__Set-Cookie: x___.pdf"' in value
+        assert "filename*=UTF-8''a%0D%0ASet-Cookie%3A%20x%09%00%7F.pdf" in value
+
+    def test_quotes_and_backslashes_are_replaced(self):
+        assert 'filename="a_b_.pdf"' in build_content_disposition('a"b\\.pdf')
+
+    def test_directory_components_are_dropped(self):
+        assert 'filename="report.pdf"' in build_content_disposition("../../etc/report.pdf")
+
+
+class TestPresignedUrlCache:
+    @pytest.fixture
+    def service(self, monkeypatch) -> S3Service:
+        service = S3Service(bucket_name="restomate-test", region_name="ap-south-1")
+        service.client = MagicMock()
+        service.client.generate_presigned_url.side_effect = (
+            lambda ClientMethod, Params, ExpiresIn: f"https://signed/{Params['Key']}/{ExpiresIn}"
+        )
+        monkeypatch.setattr(s3_module.settings, "s3_presigned_url_cache_seconds", 300)
+        return service
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(s3_module.time, "monotonic", lambda: now[0])
+        return now
+
+    def test_get_url_is_reused(self, service, clock):
+        first = service.generate_presigned_url("a.jpg")
+        clock[0] += 299
+
+        assert service.generate_presigned_url("a.jpg") == first
+        assert service.client.generate_presigned_url.call_count == 1
+
+    def test_url_is_signed_again_after_reuse_window(self, service, clock):
+        service.generate_presigned_url("a.jpg")
+        clock[0] += 300
+        service.generate_presigned_url("a.jpg")
+
+        assert service.client.generate_presigned_url.call_count == 2
+
+    def test_reuse_window_is_at_most_half_the_expiration(self, service, clock):
+        service.generate_presigned_url("a.jpg", expiration=120)
+        clock[0] += 60
+        service.generate_presigned_url("a.jpg", expiration=120)
+
+        assert service.client.generate_presigned_url.call_count == 2
+
+    def test_cache_key_includes_expiration_and_filename(self, service, clock):
+        service.generate_presigned_url("a.jpg")
+        service.generate_presigned_url("a.jpg", expiration=600)
+        service.generate_presigned_url("a.jpg", download_filename="photo.jpg")
+
+        assert service.client.generate_presigned_url.call_count == 3
+
+    def test_put_urls_are_not_cached(self, service, clock):
+        service.generate_presigned_url("a.jpg", http_method="PUT")
+        service.generate_presigned_url("a.jpg", http_method="PUT")
+
+        assert service.client.generate_presigned_url.call_count == 2
+        assert not service._presigned_url_cache
+
+    def test_least_recently_used_entry_is_evicted(self, service, clock, monkeypatch):
+        monkeypatch.setattr(S3Service, "PRESIGNED_URL_CACHE_SIZE", 2)
+
+        service.generate_presigned_url("a.jpg")
+        service.generate_presigned_url("b.jpg")
+        service.generate_presigned_url("a.jpg")
+        service.generate_presigned_url("c.jpg")
+
+        assert [key for key, _, _ in service._presigned_url_cache] == ["a.jpg", "c.jpg"]
+
+    def test_batch_signs_each_key_once(self, service, clock):
+        urls = service.generate_presigned_urls(["a.jpg", "b.jpg", "a.jpg"])
+
+        assert set(urls) == {"a.jpg", "b.jpg"}
+        assert service.client.generate_presigned_url.call_count == 2
@@ -0,0 +1,82 @@
+# tests/test_sms_service.py
+
+"""
+Tests for SMS encoding classification, part counting and truncation
+"""
+
+import pytest
+
+from src.common.sms_service import SNSSMSService
+
+
+@pytest.fixture
+def service() -> SNSSMSService:
+    # Only the pure message helpers are exercised, so no client is needed
+    return SNSSMSService.__new__(SNSSMSService)
+
+
+class TestClassifyMessage:
+    def test_plain_gsm7(self):
+        assert SNSSMSService._classify_message("Hello @ 10:00") == (True, 13)
+
+    def test_extended_characters_count_twice(self):
+        assert SNSSMSService._classify_message("a{b}€") == (True, 8)
+
+    def test_non_gsm7_is_ucs2(self):
+        assert SNSSMSService._classify_message("Order 中 ready") == (False, 13)
+
+    def test_empty_message(self):
+        assert SNSSMSService._classify_message("") == (True, 0)
+
+
+class TestCalculateMessageParts:
+    @pytest.mark.parametrize(
+        ("message", "parts"),
+        [
+            ("a" * 160, 1),
+            ("a" * 161, 2),
+            ("a" * 306, 2),
+            ("a" * 307, 3),
+            ("{" * 80, 1),
+            ("{" * 81, 2),
+            ("中" * 70, 1),
+            ("中" * 71, 2),
+            ("中" * 134, 2),
+            ("中" * 135, 3),
+        ],
+    )
+    def test_segment_boundaries(self, service, message, parts):
+        assert service._calculate_message_parts(message) == parts
+
+
+class TestOptimizeMessage:
+    def test_short_message_is_unchanged(self, service):
+        assert service._optimize_message("Your order is ready", 1) == ("Your order is ready", 1)
+
+    @pytest.mark.parametrize(("max_parts", "length"), [(1, 160), (2, 306), (3, 459)])
+    def test_gsm7_truncated_to_capacity(self, service, max_parts, length):
+        truncated, parts = service._optimize_message("a" * 1000, max_parts)
+
+        assert truncated == "a" * (length - 3) + "..."
+        assert parts == max_parts
+
+    @pytest.mark.parametrize(("max_parts", "length"), [(1, 70), (2, 134), (3, 201)])
+    def test_ucs2_ellipsis_stays_within_capacity(self, service, max_parts, length):
+        truncated, parts = service._optimize_message("中" * 1000, max_parts)
+
+        assert len(truncated) == length
+        assert truncated.endswith("...")
+        assert parts == max_parts
+
+    def test_truncation_dropping_non_gsm7_is_recounted(self, service):
+        truncated, parts = service._optimize_message("a" * 100 + "中", 1)
+
+        assert truncated == "a" * 67 + "..."
+        assert parts == 1
+
+    @pytest.mark.parametrize("max_parts", [1, 2, 3])
+    def test_reported_parts_match_truncated_text(self, service, max_parts):
+        message = "Ready: " + "ab{c}é " * 60 + "中"
+        truncated, parts = service._optimize_message(message, max_parts)
+
+        assert parts == service._calculate_message_parts(truncated)